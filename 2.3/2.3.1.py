@@ -1,3 +1,4 @@
+import os
 from csv import reader as csv_reader
 from re import sub
 from typing import List
@@ -10,6 +11,10 @@ from openpyxl import Workbook
 from openpyxl.styles import Font, Border, Side
 from openpyxl.styles.numbers import FORMAT_PERCENTAGE_00
 
+from Deduplication import Deduplicator
+from Partitions import PartitionedCSV
+from TimeIndex import get_period_rows
+
 
 
 
@@ -79,21 +84,31 @@ class UserInterface:
         Путь до CSV.
     profession_name : str
         Название профессии, которое вводит юзер. 
+    date_from : str
+        Начало периода публикации вакансий, None - без ограничения.
+    date_to : str
+        Конец периода публикации вакансий (не включительно), None - без ограничения.
     """
 
     file_name: str
     profession_name: str
+    date_from: str or None
+    date_to: str or None
 
-    def __init__(self, file_name: str = None):
+    def __init__(self, file_name: str = None, date_from: str = None, date_to: str = None):
         """Принимает CSV и создает объект UserInterface
 
         :param file_name: Путь до CSV.
+        :param date_from: Начало периода публикации вакансий.
+        :param date_to: Конец периода публикации вакансий.
         """
         if file_name is not None:
             self.file_name = file_name
         else:
             self.file_name = "vacancies_medium.csv"
         self.profession_name = 'Программист'
+        self.date_from = date_from
+        self.date_to = date_to
 
 
 class CSV:
@@ -113,10 +128,11 @@ class CSV:
     title: list
     rows: list
 
-    def __init__(self, file_name: str):
+    def __init__(self, file_name: str, deduplicator: Deduplicator = None):
         """Инициализирует объект CSV, пытается прочесть файл с переданным именем.
 
         :param file_name: Путь до CSV.
+        :param deduplicator: Если передан, повторяющиеся вакансии отбрасываются ещё при чтении.
         """
         with open(file_name, 'r', newline='', encoding='utf-8-sig') as file:
             self.data = csv_reader(file)
@@ -125,8 +141,11 @@ class CSV:
             except StopIteration:
                 custom_quit('Пустой файл')
 
-            self.rows = [row for row in self.data
-                         if len(list(filter(lambda word: word != '', row))) == len(self.title)]
+            rows = (row for row in self.data
+                    if len(list(filter(lambda word: word != '', row))) == len(self.title))
+            if deduplicator is not None:
+                rows = deduplicator.filter(rows, self.title)
+            self.rows = list(rows)
 
             if len(self.rows) == 0:
                 custom_quit('Нет данных')
@@ -725,8 +744,15 @@ def parse_row_vacancy(header: list, row_vacs: list) -> dict:
 if __name__ == '__main__':
     translator = Translator()
     ui = UserInterface()
-    csv = CSV(ui.file_name)
-    title, row_vacancies = csv.title, csv.rows
+    deduplicator = Deduplicator()
+    if os.path.isdir(ui.file_name):
+        csv = PartitionedCSV(ui.file_name, ui.date_from and int(ui.date_from[:4]), ui.date_to and int(ui.date_to[:4]),
+                             deduplicator)
+    else:
+        csv = CSV(ui.file_name, deduplicator)
+    deduplicator.close()
+    print(f'Удалено дубликатов: {deduplicator.dropped}')
+    title, row_vacancies = csv.title, get_period_rows(csv.title, csv.rows, ui.date_from, ui.date_to)
     vacancies = [Vacancy(parse_row_vacancy(title, row_vac)) for row_vac in row_vacancies]
     ds = DataSet(vacancies, ui.profession_name)
     statistics = ds.get_data()
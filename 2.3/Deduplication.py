@@ -0,0 +1,343 @@
+import os
+import sqlite3
+import tempfile
+from argparse import ArgumentParser
+from csv import reader as csv_reader, writer as csv_writer
+from hashlib import blake2b
+from math import ceil, log
+from typing import Iterable, Iterator, List
+
+DEFAULT_KEY: tuple = ("name", "salary_from", "salary_to", "salary_currency", "salary", "area_name", "published_at")
+
+
+class MemoryKeyStore:
+    """
+    Хранилище отпечатков ключей в памяти. Точное, но требует ~100 байт на каждую уникальную вакансию.
+
+    Attributes
+    ----------
+    keys : set
+        Множество уже встреченных отпечатков.
+    """
+
+    keys: set
+
+    def __init__(self):
+        self.keys = set()
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def add(self, digest: bytes) -> bool:
+        """
+        Добавляет отпечаток в хранилище.
+
+        :param digest: Отпечаток ключа вакансии.
+        :returns: True, если отпечаток встретился впервые.
+
+        >>> store = MemoryKeyStore()
+        >>> store.add(b'a'), store.add(b'a')
+        (True, False)
+        """
+        if digest in self.keys:
+            return False
+        self.keys.add(digest)
+        return True
+
+    def close(self) -> None:
+        self.keys.clear()
+
+
+class DiskKeyStore:
+    """
+    Хранилище отпечатков во временной базе SQLite. Точное, память ограничена кэшем страниц SQLite.
+
+    Attributes
+    ----------
+    connection : sqlite3.Connection
+        Соединение с временной базой отпечатков.
+    """
+
+    connection: sqlite3.Connection
+    _path: str
+    _count: int
+
+    def __init__(self, directory: str = None):
+        """
+        Создаёт временную базу для отпечатков.
+
+        :param directory: Папка для временного файла. По-умолчанию - системная временная папка.
+        """
+        descriptor, self._path = tempfile.mkstemp(prefix="dedup_", suffix=".db", dir=directory)
+        os.close(descriptor)
+        self.connection = sqlite3.connect(self._path)
+        self.connection.execute("PRAGMA journal_mode = OFF")
+        self.connection.execute("PRAGMA synchronous = OFF")
+        self.connection.execute("CREATE TABLE KEYS (digest BLOB PRIMARY KEY) WITHOUT ROWID")
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def add(self, digest: bytes) -> bool:
+        """
+        Добавляет отпечаток в хранилище.
+
+        :param digest: Отпечаток ключа вакансии.
+        :returns: True, если отпечаток встретился впервые.
+        """
+        is_new = self.connection.execute("INSERT OR IGNORE INTO KEYS VALUES (?)", (digest,)).rowcount == 1
+        self._count += is_new
+        return is_new
+
+    def close(self) -> None:
+        self.connection.close()
+        os.remove(self._path)
+
+
+class BloomFilter:
+    """
+    Фильтр Блума. Память фиксирована заранее, но с вероятностью error_rate уникальная вакансия может быть
+    ошибочно принята за дубликат.
+
+    Attributes
+    ----------
+    bits : bytearray
+        Битовый массив фильтра.
+    size : int
+        Количество бит в массиве.
+    hash_count : int
+        Количество хэш-функций.
+    """
+
+    bits: bytearray
+    size: int
+    hash_count: int
+    _count: int
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        """
+        Рассчитывает размер фильтра под ожидаемое количество вакансий.
+
+        :param capacity: Ожидаемое количество уникальных вакансий.
+        :param error_rate: Допустимая доля ложных срабатываний.
+        """
+        self.size = max(8, ceil(-capacity * log(error_rate) / log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * log(2)))
+        self.bits = bytearray(ceil(self.size / 8))
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _positions(self, digest: bytes) -> Iterator[int]:
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:16], "little") | 1
+        for i in range(self.hash_count):
+            yield (first + i * second) % self.size
+
+    def add(self, digest: bytes) -> bool:
+        """
+        Добавляет отпечаток в фильтр.
+
+        :param digest: Отпечаток ключа вакансии, не короче 16 байт.
+        :returns: True, если отпечаток (вероятно) встретился впервые.
+        """
+        is_new = False
+        for position in self._positions(digest):
+            byte, bit = divmod(position, 8)
+            if not self.bits[byte] >> bit & 1:
+                self.bits[byte] |= 1 << bit
+                is_new = True
+        self._count += is_new
+        return is_new
+
+    def close(self) -> None:
+        self.bits = bytearray()
+
+
+class Deduplicator:
+    """
+    Потоковое удаление повторяющихся вакансий за один проход по строкам CSV-файла.
+
+    Attributes
+    ----------
+    key : tuple or None
+        Названия столбцов, по которым вакансии считаются одинаковыми. None - столбцы DEFAULT_KEY, которые есть
+        в заголовке файла: зарплата salary_from, salary_to, salary_currency в CSV-файлах 2.3 и salary в 3.4.
+    mode : str
+        Режим хранения ключей: 'memory', 'disk', 'bloom' или 'auto' (память, а после max_in_memory ключей - диск).
+    dropped : int
+        Количество отброшенных строк-дубликатов.
+    """
+
+    key: tuple or None
+    mode: str
+    dropped: int
+    max_in_memory: int
+    capacity: int
+    error_rate: float
+    directory: str
+    store: MemoryKeyStore or DiskKeyStore or BloomFilter
+
+    def __init__(self, key: Iterable[str] = None, mode: str = "auto", max_in_memory: int = 1_000_000,
+                 capacity: int = 10_000_000, error_rate: float = 0.001, directory: str = None):
+        """
+        Инициализирует объект Deduplicator.
+
+        :param key: Названия столбцов ключа. По-умолчанию - столбцы DEFAULT_KEY из заголовка файла.
+        :param mode: Режим хранения ключей: 'memory', 'disk', 'bloom' или 'auto'.
+        :param max_in_memory: Порог количества ключей, после которого режим 'auto' переходит на диск.
+        :param capacity: Ожидаемое количество уникальных вакансий для режима 'bloom'.
+        :param error_rate: Доля ложных срабатываний для режима 'bloom'.
+        :param directory: Папка для временной базы режима 'disk'.
+        """
+        if mode not in ("memory", "disk", "bloom", "auto"):
+            raise ValueError(f"Неизвестный режим удаления дубликатов: {mode}")
+        self.key = None if key is None else tuple(key)
+        self.mode = mode
+        self.dropped = 0
+        self.max_in_memory = max_in_memory
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.directory = directory
+
+        if mode == "disk":
+            self.store = DiskKeyStore(directory)
+        elif mode == "bloom":
+            self.store = BloomFilter(capacity, error_rate)
+        else:
+            self.store = MemoryKeyStore()
+
+    def get_digest(self, values: Iterable[str]) -> bytes:
+        """
+        Вычисляет отпечаток ключа вакансии.
+
+        :param values: Значения столбцов ключа.
+        :returns: 16-байтовый отпечаток.
+        """
+        return blake2b("\x1f".join(values).encode("utf-8"), digest_size=16).digest()
+
+    def is_new(self, values: Iterable[str]) -> bool:
+        """
+        Проверяет, встречалась ли уже вакансия с такими значениями ключа, и запоминает её.
+
+        :param values: Значения столбцов ключа.
+        :returns: True, если вакансия встретилась впервые.
+
+        >>> d = Deduplicator(mode='memory')
+        >>> [d.is_new(v) for v in (['a', '1'], ['a', '2'], ['a', '1'])]
+        [True, True, False]
+        >>> d.dropped
+        1
+        """
+        if self.store.add(self.get_digest(values)):
+            self._spill_if_needed()
+            return True
+        self.dropped += 1
+        return False
+
+    def _spill_if_needed(self) -> None:
+        """
+        В режиме 'auto' переносит ключи из памяти на диск, когда их становится больше max_in_memory.
+        """
+        if self.mode != "auto" or not isinstance(self.store, MemoryKeyStore) or len(self.store) <= self.max_in_memory:
+            return
+        disk_store = DiskKeyStore(self.directory)
+        with disk_store.connection:
+            disk_store.connection.executemany("INSERT INTO KEYS VALUES (?)", ((k,) for k in self.store.keys))
+        disk_store._count = len(self.store)
+        self.store.close()
+        self.store = disk_store
+
+    def get_key_positions(self, header: List[str]) -> List[int]:
+        """
+        Возвращает позиции столбцов ключа в заголовке CSV-файла.
+
+        :param header: Заголовок CSV-файла.
+        :returns: Номера столбцов ключа.
+
+        >>> Deduplicator(mode='memory').get_key_positions(['name', 'salary', 'area_name', 'published_at'])
+        [0, 1, 2, 3]
+        >>> Deduplicator(key=('name', 'salary_from'), mode='memory').get_key_positions(['name', 'salary'])
+        Traceback (most recent call last):
+        ...
+        ValueError: В заголовке нет столбцов ключа: salary_from
+        """
+        if self.key is None:
+            positions = [position for position, column in enumerate(header) if column in DEFAULT_KEY]
+            if not positions:
+                raise ValueError(f"В заголовке нет ни одного из столбцов ключа: {', '.join(DEFAULT_KEY)}")
+            return positions
+        missing = [column for column in self.key if column not in header]
+        if missing:
+            raise ValueError(f"В заголовке нет столбцов ключа: {', '.join(missing)}")
+        return [header.index(column) for column in self.key]
+
+    def filter(self, rows: Iterable[List[str]], header: List[str]) -> Iterator[List[str]]:
+        """
+        Пропускает дальше только первые вхождения вакансий.
+
+        :param rows: Строки CSV-файла без заголовка.
+        :param header: Заголовок CSV-файла, по нему определяются позиции столбцов ключа.
+        :returns: Генератор строк без дубликатов.
+
+        >>> d = Deduplicator(key=('name',), mode='memory')
+        >>> list(d.filter([['a', '1'], ['b', '1'], ['a', '2']], ['name', 'salary']))
+        [['a', '1'], ['b', '1']]
+        """
+        positions = self.get_key_positions(header)
+        for row in rows:
+            if self.is_new([row[i] for i in positions]):
+                yield row
+
+    def close(self) -> None:
+        """
+        Освобождает хранилище ключей.
+        """
+        self.store.close()
+
+
+def deduplicate_csv(source: str, destination: str, key: Iterable[str] = None, mode: str = "auto",
+                    **kwargs) -> int:
+    """
+    Переписывает CSV-файл без повторяющихся вакансий за один потоковый проход.
+
+    :param source: Путь до исходного CSV-файла.
+    :param destination: Путь до нового CSV-файла.
+    :param key: Названия столбцов ключа. По-умолчанию - столбцы DEFAULT_KEY из заголовка файла.
+    :param mode: Режим хранения ключей, см. Deduplicator.
+    :param kwargs: Остальные параметры Deduplicator.
+    :returns: Количество отброшенных строк.
+    """
+    deduplicator = Deduplicator(key, mode, **kwargs)
+    try:
+        with open(source, "r", newline="", encoding="utf-8-sig") as src, \
+                open(destination, "w", newline="", encoding="utf-8") as dst:
+            rows = csv_reader(src)
+            header = next(rows)
+            writer = csv_writer(dst)
+            writer.writerow(header)
+            writer.writerows(deduplicator.filter(rows, header))
+    finally:
+        deduplicator.close()
+    return deduplicator.dropped
+
+
+def main() -> None:
+    parser = ArgumentParser(description="Удаление повторяющихся вакансий из CSV-файла.")
+    parser.add_argument("source", help="Исходный CSV-файл.")
+    parser.add_argument("destination", help="CSV-файл без дубликатов.")
+    parser.add_argument("--key", default=None,
+                        help="Столбцы ключа через запятую. По-умолчанию - столбцы DEFAULT_KEY, которые есть в файле.")
+    parser.add_argument("--mode", default="auto", choices=["memory", "disk", "bloom", "auto"])
+    parser.add_argument("--capacity", type=int, default=10_000_000, help="Ожидаемое число вакансий для 'bloom'.")
+    args = parser.parse_args()
+
+    key = args.key and args.key.split(",")
+    dropped = deduplicate_csv(args.source, args.destination, key, args.mode, capacity=args.capacity)
+    print(f"Удалено дубликатов: {dropped}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+import os
+import re
+from csv import reader as csv_reader
+
+PARTITION_KEY = re.compile(r'\d{4}(-\d{2})?')
+
+
+def custom_quit(msg: str) -> None:
+    """
+    Выход из программы с выводом сообщения на консоль.
+
+    :param msg: Сообщение, выводимое на консоль.
+    """
+
+    print(msg)
+    quit()
+
+
+def get_partition_files(directory: str, year_from: int = None, year_to: int = None) -> list:
+    """
+    Возвращает отсортированные пути до партиций (файлов 2022.csv или 2022-07.csv), попадающих в диапазон лет.
+    Партиции создаются скриптом 3.4/Partitions.py, посторонние CSV-файлы в папке пропускаются.
+
+    :param directory: Папка с партициями.
+    :param year_from: Первый год включительно. None - без ограничения.
+    :param year_to: Последний год включительно. None - без ограничения.
+    """
+    files = []
+    for file_name in sorted(os.listdir(directory)):
+        key, extension = os.path.splitext(file_name)
+        if extension != '.csv' or PARTITION_KEY.fullmatch(key) is None:
+            continue
+        year = int(key[:4])
+        if (year_from is None or year >= year_from) and (year_to is None or year <= year_to):
+            files.append(os.path.join(directory, file_name))
+    return files
+
+
+class PartitionedCSV:
+    """Класс чтения набора партиций CSV-файла. Повторяет интерфейс класса CSV.
+
+    Attributes
+    ----------
+    title : list
+        Список заголовков столбцов, общий для всех партиций.
+    rows : list
+        Список строк с данными о вакансии из партиций нужных лет.
+    files : list
+        Прочитанные партиции.
+    """
+
+    title: list
+    rows: list
+    files: list
+
+    def __init__(self, directory: str, year_from: int = None, year_to: int = None, deduplicator=None):
+        """
+        Читает только партиции из диапазона лет, остальные файлы не открываются.
+
+        :param directory: Папка с партициями.
+        :param year_from: Первый год включительно.
+        :param year_to: Последний год включительно.
+        :param deduplicator: Если передан, повторяющиеся вакансии отбрасываются ещё при чтении.
+        """
+        self.title = []
+        self.rows = []
+        self.files = get_partition_files(directory, year_from, year_to)
+        for file_name in self.files:
+            with open(file_name, 'r', newline='', encoding='utf-8-sig') as file:
+                data = csv_reader(file)
+                self.title = next(data, self.title)
+                rows = (row for row in data if len(list(filter(lambda word: word != '', row))) == len(self.title))
+                if deduplicator is not None:
+                    rows = deduplicator.filter(rows, self.title)
+                self.rows.extend(rows)
+
+        if len(self.rows) == 0:
+            custom_quit('Нет данных')
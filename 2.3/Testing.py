@@ -1,3 +1,4 @@
+import os
 from csv import reader as csv_reader
 from re import sub
 from typing import List
@@ -11,6 +12,10 @@ from openpyxl import Workbook
 from openpyxl.styles import Font, Border, Side
 from openpyxl.styles.numbers import FORMAT_PERCENTAGE_00
 
+from Deduplication import Deduplicator
+from Partitions import PartitionedCSV
+from TimeIndex import get_period_rows
+
 
 def custom_quit(msg: str) -> None:
     """
@@ -70,17 +75,26 @@ class UserInterface:
         Путь до CSV-файла.
     profession_name : str
         Название профессии, введённое пользователем.
+    date_from : str
+        Начало периода публикации вакансий, None - без ограничения.
+    date_to : str
+        Конец периода публикации вакансий (не включительно), None - без ограничения.
     """
 
     file_name: str
     profession_name: str
+    date_from: str or None
+    date_to: str or None
 
-    def __init__(self, file_name: str = None, profession_name: str = None):
+    def __init__(self, file_name: str = None, profession_name: str = None, date_from: str = None,
+                 date_to: str = None):
         """
         Инициализирует объект UserInterface, принимает название CSV-файла.
 
         :param file_name: Путь до CSV-файла. По-умолчанию '../vacancies_medium.csv'.
         :param profession_name: Название профессии для сбора статистики. По-умолчанию 'Программист'.
+        :param date_from: Начало периода публикации вакансий в ISO-формате. По-умолчанию без ограничения.
+        :param date_to: Конец периода публикации вакансий (не включительно). По-умолчанию без ограничения.
 
         >>> u = UserInterface()
         >>> u.file_name
@@ -102,6 +116,8 @@ class UserInterface:
             self.profession_name = profession_name
         else:
             self.profession_name = 'Программист'
+        self.date_from = date_from
+        self.date_to = date_to
 
 
 class CSV:
@@ -121,12 +137,13 @@ class CSV:
     title: list
     rows: list
 
-    def __init__(self, file_name: str):
+    def __init__(self, file_name: str, deduplicator: Deduplicator = None):
         """
         Инициализирует объект CSV, пытается прочесть файл с переданным именем. Обрабатывает случаи пустого файла и
         отсутствия данных в файле.
 
         :param file_name: Путь до CSV-файла.
+        :param deduplicator: Если передан, повторяющиеся вакансии отбрасываются ещё при чтении.
 
         """
         with open(file_name, 'r', newline='', encoding='utf-8-sig') as file:
@@ -136,8 +153,11 @@ class CSV:
             except StopIteration:
                 custom_quit('Пустой файл')
 
-            self.rows = [row for row in self.data
-                         if len(list(filter(lambda word: word != '', row))) == len(self.title)]
+            rows = (row for row in self.data
+                    if len(list(filter(lambda word: word != '', row))) == len(self.title))
+            if deduplicator is not None:
+                rows = deduplicator.filter(rows, self.title)
+            self.rows = list(rows)
 
             if len(self.rows) == 0:
                 custom_quit('Нет данных')
@@ -823,8 +843,15 @@ def parse_row_vacancy(header: list, row_vacs: list) -> dict:
 if __name__ == '__main__':
     doctest.testmod()
     ui = UserInterface()
-    csv = CSV(ui.file_name)
-    title, row_vacancies = csv.title, csv.rows
+    deduplicator = Deduplicator()
+    if os.path.isdir(ui.file_name):
+        csv = PartitionedCSV(ui.file_name, ui.date_from and int(ui.date_from[:4]), ui.date_to and int(ui.date_to[:4]),
+                             deduplicator)
+    else:
+        csv = CSV(ui.file_name, deduplicator)
+    deduplicator.close()
+    print(f'Удалено дубликатов: {deduplicator.dropped}')
+    title, row_vacancies = csv.title, get_period_rows(csv.title, csv.rows, ui.date_from, ui.date_to)
     vacancies = [Vacancy(parse_row_vacancy(title, row_vac)) for row_vac in row_vacancies]
     ds = DataSet(vacancies, ui.profession_name)
     statistics = ds.get_data()
@@ -0,0 +1,93 @@
+from bisect import bisect_left
+from datetime import datetime, date, timezone
+
+
+def to_timestamp(value: str or date or datetime) -> int:
+    """
+    Переводит дату в секунды от начала эпохи по местному времени записи: часовой пояс отбрасывается, поэтому
+    вакансия попадает в период по той же дате, что и в строке published_at. Даты без часового пояса считаются
+    датами в местном времени вакансий.
+
+    :param value: Строка ISO-формата (например 2022-07-05T18:19:30+0300), date или datetime.
+
+    >>> to_timestamp('1970-01-02')
+    86400
+    >>> to_timestamp('2022-01-01T00:30:00+0300') - to_timestamp('2022-01-01')
+    1800
+    """
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    elif not isinstance(value, datetime):
+        value = datetime(value.year, value.month, value.day)
+    return int(value.replace(tzinfo=timezone.utc).timestamp())
+
+
+class TimeIndex:
+    """
+    Индекс строк CSV-файла по времени публикации. Хранит отсортированные метки времени и соответствующие номера строк,
+    период выбирается двумя бинарными поисками.
+
+    Attributes
+    ----------
+    rows : list
+        Строки CSV-файла в исходном порядке.
+    timestamps : list
+        Отсортированные метки времени в секундах.
+    positions : list
+        Номера строк в порядке возрастания времени публикации.
+    """
+
+    rows: list
+    timestamps: list
+    positions: list
+
+    def __init__(self, title: list, rows: list):
+        """
+        Строит индекс по столбцу published_at.
+
+        :param title: Список заголовков CSV-файла.
+        :param rows: Строки CSV-файла.
+        """
+        column = title.index('published_at')
+        self.rows = rows
+        pairs = sorted((to_timestamp(row[column]), position) for position, row in enumerate(rows))
+        self.timestamps = [timestamp for timestamp, _ in pairs]
+        self.positions = [position for _, position in pairs]
+
+    def get_rows(self, date_from=None, date_to=None) -> list:
+        """
+        Возвращает строки, опубликованные в полуинтервале [date_from, date_to), в исходном порядке.
+
+        :param date_from: Начало периода включительно. None - без ограничения.
+        :param date_to: Конец периода не включительно. None - без ограничения.
+
+        >>> index = TimeIndex(['name', 'published_at'], [['a', '2022-01-02T00:00:00+0000'],
+        ...                                              ['b', '2020-05-01T00:00:00+0000'],
+        ...                                              ['c', '2021-01-01T00:00:00+0000']])
+        >>> index.get_rows('2021-01-01')
+        [['a', '2022-01-02T00:00:00+0000'], ['c', '2021-01-01T00:00:00+0000']]
+        """
+        if date_from is None and date_to is None:
+            return self.rows
+        start = 0 if date_from is None else bisect_left(self.timestamps, to_timestamp(date_from))
+        end = len(self.timestamps) if date_to is None else bisect_left(self.timestamps, to_timestamp(date_to))
+        return [self.rows[position] for position in sorted(self.positions[start:end])]
+
+
+def get_period_rows(title: list, rows: list, date_from=None, date_to=None) -> list:
+    """
+    Возвращает строки за период в исходном порядке. Индекс строится, только если задана хотя бы одна граница
+    периода, без периода строки возвращаются как есть.
+
+    :param title: Список заголовков CSV-файла.
+    :param rows: Строки CSV-файла.
+    :param date_from: Начало периода включительно.
+    :param date_to: Конец периода не включительно.
+
+    >>> rows = [['a', 'не дата']]
+    >>> get_period_rows(['name', 'published_at'], rows) is rows
+    True
+    """
+    if date_from is None and date_to is None:
+        return rows
+    return TimeIndex(title, rows).get_rows(date_from, date_to)
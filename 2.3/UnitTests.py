@@ -1,5 +1,10 @@
 from Testing import Translator, Salary, Vacancy, UserInterface
+from Deduplication import Deduplicator
+from Partitions import get_partition_files
+from TimeIndex import TimeIndex
+from tempfile import TemporaryDirectory
 from unittest import TestCase
+import os
 
 
 class TranslatorTests(TestCase):
@@ -72,4 +77,71 @@ class UserInterfaceTests(TestCase):
         self.assertEqual(UserInterface().file_name, 'vacancies_medium.csv')
 
     def test_user_interface_file_name(self):
-        self.assertEqual(UserInterface(file_name='vacancies_by_year.csv').file_name, 'vacancies_by_year.csv')
\ No newline at end of file
+        self.assertEqual(UserInterface(file_name='vacancies_by_year.csv').file_name, 'vacancies_by_year.csv')
+
+
+class DeduplicatorTests(TestCase):
+    header = ['name', 'salary_from', 'salary_to', 'salary_currency', 'area_name', 'published_at']
+    rows = [['Программист', '100', '200', 'RUR', 'Москва', '2022-01-01T10:00:00+0300'],
+            ['Аналитик', '100', '200', 'RUR', 'Москва', '2022-01-01T10:00:00+0300'],
+            ['Программист', '100', '200', 'RUR', 'Москва', '2022-01-01T10:00:00+0300']]
+
+    def test_memory_mode_drops_repeats(self):
+        d = Deduplicator(mode='memory')
+        self.assertEqual(len(list(d.filter(self.rows, self.header))), 2)
+        self.assertEqual(d.dropped, 1)
+
+    def test_disk_mode_drops_repeats(self):
+        d = Deduplicator(mode='disk')
+        self.assertEqual(list(d.filter(self.rows, self.header)), self.rows[:2])
+        d.close()
+
+    def test_bloom_mode_drops_repeats(self):
+        d = Deduplicator(mode='bloom', capacity=100)
+        self.assertEqual(list(d.filter(self.rows, self.header)), self.rows[:2])
+
+    def test_auto_mode_spills_to_disk(self):
+        d = Deduplicator(key=('name',), mode='auto', max_in_memory=1)
+        self.assertEqual(len(list(d.filter(self.rows, self.header))), 2)
+        self.assertEqual(type(d.store).__name__, 'DiskKeyStore')
+        self.assertEqual(d.dropped, 1)
+        d.close()
+
+    def test_default_key_matches_header(self):
+        header = ['name', 'salary', 'area_name', 'published_at']
+        rows = [['Программист', '100', 'Москва', '2022-01-01T10:00:00+0300'],
+                ['Программист', '200', 'Москва', '2022-01-01T10:00:00+0300'],
+                ['Программист', '100', 'Москва', '2022-01-01T10:00:00+0300']]
+        d = Deduplicator(mode='memory')
+        self.assertEqual(list(d.filter(rows, header)), rows[:2])
+        with self.assertRaises(ValueError):
+            list(Deduplicator(key=self.header, mode='memory').filter(rows, header))
+
+
+class TimeIndexTests(TestCase):
+    title = ['name', 'published_at']
+    rows = [['a', '2022-01-02T00:00:00+0300'], ['b', '2020-05-01T10:00:00+0300'], ['c', '2021-01-01T10:00:00+0300']]
+
+    def test_period(self):
+        self.assertEqual(TimeIndex(self.title, self.rows).get_rows('2021-01-01', '2022-01-01'), [self.rows[2]])
+
+    def test_open_period(self):
+        self.assertEqual(TimeIndex(self.title, self.rows).get_rows(date_to='2021-01-01'), [self.rows[1]])
+
+    def test_no_period(self):
+        self.assertEqual(TimeIndex(self.title, self.rows).get_rows(), self.rows)
+
+    def test_naive_bounds_use_local_date(self):
+        rows = [['a', '2022-01-01T01:30:00+0300'], ['b', '2021-12-31T23:30:00+0300']]
+        self.assertEqual(TimeIndex(self.title, rows).get_rows('2022-01-01'), [rows[0]])
+
+
+class PartitionsTests(TestCase):
+    def test_partition_files_skip_other_csv(self):
+        with TemporaryDirectory() as directory:
+            for file_name in ('2021.csv', '2022-07.csv', 'backup.csv', '2023.txt'):
+                open(os.path.join(directory, file_name), 'w').close()
+            self.assertEqual([os.path.basename(file_name) for file_name in get_partition_files(directory)],
+                             ['2021.csv', '2022-07.csv'])
+            self.assertEqual([os.path.basename(file_name) for file_name in get_partition_files(directory, 2022)],
+                             ['2022-07.csv'])
@@ -1,13 +1,16 @@
-import pandas as pd
 from openpyxl import Workbook
 from openpyxl.styles import Font, Border, Side
 import matplotlib.pyplot as plt
 import numpy as np
 from jinja2 import Environment, FileSystemLoader
 import pdfkit
-import datetime as dt
 import os
 
+from Aggregation import aggregate_chunks, get_statistics
+from Cube import Cube
+from Loader import is_large_file, iter_vacancies, load_vacancies
+from Taxonomy import Taxonomy, LabelIndex
+
 
 class UserInput:
     file_name: str
@@ -368,53 +371,27 @@ class Report:
     # endregion
 
 
-def get_salaries_by_years(df: pd.DataFrame) -> dict:
-    return (df
-            .groupby("published_at")["salary"].agg(np.sum)
-            .floordiv(df
-                      .groupby('published_at')['published_at']
-                      .count())
-            .to_dict()
-            )
-
-
-def get_vacancies_count_by_years(df: pd.DataFrame) -> dict:
-    return (
-        df
-        .value_counts("published_at", ascending=True)
-        .sort_index()
-        .to_dict()
-    )
-
-
-def check_substring_in_name(df: pd.DataFrame, name: str) -> pd.DataFrame:
-    return df.loc[
-        df["name"]
-        .apply(lambda s: s.lower())
-        .str.contains(name.lower())
-    ]
-
-
-def get_data_by_years(df: pd.DataFrame, profession_name: str) -> dict:
-    salaries_by_years = df.pipe(get_salaries_by_years)
-    vacancies_count_by_years = df.pipe(get_vacancies_count_by_years)
-    profession_salaries_by_years = check_substring_in_name(df, profession_name).pipe(get_salaries_by_years)
-    profession_vacancies_count_by_years = check_substring_in_name(df, profession_name).pipe(
-        get_vacancies_count_by_years)
-    return {
-        "Уровень зарплат по годам": (salaries_by_years, profession_salaries_by_years),
-        "Количество вакансий по годам": (vacancies_count_by_years, profession_vacancies_count_by_years)
-    }
+def get_data_by_chunks(ui: UserInput, taxonomy: Taxonomy) -> dict:
+    """
+    Считает статистику по CSV-файлу частями, для файлов, которые не помещаются в память. Каждая часть
+    классифицируется отдельно.
+    """
+    chunks = (taxonomy.classify(chunk) for chunk in iter_vacancies(ui.file_name, salary_dtype="Int32"))
+    return aggregate_chunks(chunks, ui.profession_name, lambda chunk: LabelIndex(taxonomy, chunk))
 
 
 def main() -> None:
     hh_ru = "../API/hh_ru_joined_salary.csv"
     big = "vacancies_joined_salary.csv"
     ui = UserInput(big, "Программист|IT|Senior|Middle|Junior|Аналитик")
-    df = pd.read_csv(ui.file_name, dtype={"name": "str", "salary": "Int32", "area_name": "str"}, verbose=True)
-    df = df.assign(published_at=df['published_at'].apply(lambda s: dt.datetime.fromisoformat(s).year).astype("int32"))
-
-    data = get_data_by_years(df, ui.profession_name)
+    taxonomy = Taxonomy()
+    if taxonomy.is_label_query(ui.profession_name):
+        data = Cube.for_file(ui.file_name, taxonomy).get_statistics(ui.profession_name)
+    elif is_large_file(ui.file_name):
+        data = get_data_by_chunks(ui, taxonomy)
+    else:
+        df = taxonomy.classify(load_vacancies(ui.file_name, salary_dtype="Int32"))
+        data = get_statistics(df, ui.profession_name, LabelIndex(taxonomy, df))
 
     report = Report(data, ui.profession_name)
     report.generate_pdf("report.pdf")
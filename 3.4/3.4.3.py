@@ -1,21 +1,46 @@
 import pandas as pd
 from openpyxl import Workbook
-from openpyxl.styles import Font, Border, Side
+from openpyxl.styles import Font
 from openpyxl.styles.numbers import FORMAT_PERCENTAGE_00
 import matplotlib.pyplot as plt
 import numpy as np
-from jinja2 import Environment, FileSystemLoader
 import pdfkit
-import datetime as dt
 import os
+import re
+from base64 import b64encode
+from io import BytesIO
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import repeat
+
+from Aggregation import aggregate_chunks, get_city_statistics, get_partial_statistics, finalize_statistics, \
+    get_batch_data, get_statistics
+from ArtifactCache import ArtifactCache, get_report_key
+from ChartRenderer import get_chart_renderer
+from Cube import Cube
+from ExcelWriter import StreamingExcelWriter, THIN_BORDER, add_report_charts
+from Loader import PARQUET_SUFFIX, add_year, is_large_file, iter_vacancies, load_parquet, load_vacancies
+from NameIndex import NameIndex
+from Partitions import aggregate_partitions
+from PdfWriter import PdfWriter
+from SharedColumns import SharedColumns
+from SvgCharts import get_bar_chart, get_horizontal_bar_chart, get_pie_chart
+from Taxonomy import Taxonomy
+from Templates import get_template, render_to_file
+from TimeIndex import slice_period
+from TrigramIndex import TrigramIndex
+
+DRAFT_DPI = 72
 
 
 class UserInput:
     file_name: str
     profession_name: str
     area_name: str
+    date_from: str or None
+    date_to: str or None
 
-    def __init__(self, file_name: str = None, profession_name: str = None, area_name: str = None):
+    def __init__(self, file_name: str = None, profession_name: str = None, area_name: str = None,
+                 date_from: str = None, date_to: str = None):
         if file_name is not None:
             self.file_name = file_name
         else:
@@ -32,6 +57,9 @@ class UserInput:
         else:
             self.area_name = self._get_correct_input("Введите название региона: ", 'str')
 
+        self.date_from = date_from
+        self.date_to = date_to
+
     def _get_correct_input(self, question: str, input_type: str,
                            error_msg: str = "Данные некорректны, повторите ввод.") -> str:
         user_input = input(question)
@@ -40,6 +68,9 @@ class UserInput:
             user_input = input(question)
         return user_input
 
+    def confirm(self, question: str) -> bool:
+        return self._get_correct_input(f"{question} (да/нет): ", 'bool').lower() == 'да'
+
     @staticmethod
     def _is_correct_input(user_input: str, input_type: str) -> bool:
         if user_input == "" or input_type == "":
@@ -60,10 +91,13 @@ class Report:
         Класс, содержащий в себе функционал для работы с Excel таблицей.
     data : dict
         Словарь данных, получаемый из DataSet.
+    profession_query : str
+        Исходный запрос профессии, из которого Report пересоздаётся в рабочих процессах.
     """
     workbook: Workbook
     data: dict
     profession_name: str
+    profession_query: str
 
     def __init__(self, data: dict, profession_name: str):
         """Инициализирует объект Report. Создаёт пустой Workbook, распаковывает kwargs.
@@ -72,6 +106,7 @@ class Report:
         """
         self.workbook = Workbook()
         self.data = data
+        self.profession_query = profession_name
         professions = profession_name.split('|')
         if len(professions) > 1:
             self.profession_name = f'\"{professions[0]}\" и ещё {len(professions) - 1}'
@@ -79,22 +114,89 @@ class Report:
             self.profession_name = f'\"{profession_name}\"'
 
     # region Excel
-    def generate_excel(self, file_name: str) -> None:
+    def generate_excel(self, file_name: str, streaming: bool = False, extra_sheets: dict = None,
+                       charts: bool = False) -> None:
         """
         Генерирует и сохраняет Excel-файл.
 
         :param file_name: название Excel-файла с явно указанным расширением.
+        :param streaming: Записывать строки потоково (StreamingExcelWriter) вместо книги в памяти.
+        :param extra_sheets: Дополнительные листы для потоковой записи: {название: (заголовки, строки)}.
+        :param charts: Добавить диаграммы Excel, построенные по ячейкам статистики. Не требует matplotlib.
+        """
+        if not streaming:
+            self.fill_with_statistics(others=charts)
+            if charts:
+                self.add_charts(self.workbook['Статистика по годам'], self.workbook['Статистика по городам'])
+            self.workbook.save(file_name)
+            return
+
+        with StreamingExcelWriter(file_name) as writer:
+            years_ws, cities_ws = self.write_statistics(writer, others=charts)
+            if charts:
+                self.add_charts(years_ws, cities_ws)
+            for title, (header, rows) in (extra_sheets or {}).items():
+                writer.write_rows(title, header, rows)
+
+    def write_statistics(self, writer: StreamingExcelWriter, others: bool = False) -> tuple:
         """
-        self.fill_with_statistics()
-        self.workbook.save(file_name)
+        Записывает те же два листа, что и fill_with_statistics, через потоковый writer.
 
-    def fill_with_statistics(self) -> None:
+        :param writer: Открытый StreamingExcelWriter.
+        :param others: Дописать к долям вакансий строку 'Другие', как в fill_cities_statistics.
+        :returns: Листы статистики по годам и по городам.
+        """
+        salaries_by_years, profession_salaries_by_years = self.data["Уровень зарплат по годам"]
+        vacancies_by_years, profession_vacancies_by_years = self.data["Количество вакансий по годам"]
+        years_ws = writer.write_columns('Статистика по годам', [
+            ('Год', salaries_by_years.keys()),
+            ('Средняя зарплата', salaries_by_years.values()),
+            (f'Средняя зарплата - {self.profession_name}', profession_salaries_by_years.values()),
+            ('Количество вакансий', vacancies_by_years.values()),
+            (f'Количество вакансий - {self.profession_name}', profession_vacancies_by_years.values()),
+        ])
+
+        salaries_by_cities = self.data["Уровень зарплат по городам"]
+        vacs_ratio_by_cities = self.get_vacancy_ratios(others)
+        cities_ws = writer.write_columns('Статистика по городам', [
+            ('Город', salaries_by_cities.keys()),
+            ('Уровень зарплат', salaries_by_cities.values()),
+            None,
+            ('Город', vacs_ratio_by_cities.keys()),
+            ('Доля вакансий', vacs_ratio_by_cities.values()),
+        ], percent_columns=[4])
+        return years_ws, cities_ws
+
+    def add_charts(self, years_ws, cities_ws) -> None:
+        """
+        Добавляет диаграммы Excel: столбчатые по годам, горизонтальную по зарплатам в городах и круговую по долям.
+
+        :param years_ws: Лист статистики по годам.
+        :param cities_ws: Лист статистики по городам.
+        """
+        add_report_charts(years_ws, cities_ws, len(self.data["Уровень зарплат по годам"][0]),
+                          len(self.data["Уровень зарплат по городам"]), len(self.get_vacancy_ratios(others=True)))
+
+    def get_vacancy_ratios(self, others: bool = False) -> dict:
+        """
+        Возвращает доли вакансий по городам для листа Excel.
+
+        :param others: Добавить в конец долю 'Другие' - остаток до 100%, как на круговых диаграммах draw_pie_graph
+            и render_svg_graphs. Нужна круговой диаграмме Excel, иначе доли городов растягиваются до 100%.
+        """
+        ratios = dict(self.data["Доля вакансий по городам"])
+        if others:
+            ratios['Другие'] = 1 - sum(ratios.values())
+        return ratios
+
+    def fill_with_statistics(self, others: bool = False) -> None:
         """
         Заполняет два листа Excel-файла статистикой.
 
+        :param others: Дописать к долям вакансий строку 'Другие' для круговой диаграммы.
         """
         self.fill_salaries_statistics()
-        self.fill_cities_statistics()
+        self.fill_cities_statistics(others)
 
     def fill_salaries_statistics(self) -> None:
         """
@@ -125,15 +227,16 @@ class Report:
 
         self.update_worksheet_settings(ws)
 
-    def fill_cities_statistics(self) -> None:
+    def fill_cities_statistics(self, others: bool = False) -> None:
         """
         Создаёт и переключается на второй лист Excel-файла. Заполняет его данными о городах и зарплатах.
 
+        :param others: Дописать к долям вакансий строку 'Другие' - остаток до 100%.
         """
         self.workbook.create_sheet("Статистика по городам")
         ws = self.workbook["Статистика по городам"]
         salaries_by_cities = self.data["Уровень зарплат по городам"]
-        vacs_ratio_by_cities = self.data["Доля вакансий по городам"]
+        vacs_ratio_by_cities = self.get_vacancy_ratios(others)
 
         self.fill_column('Город', list(salaries_by_cities.keys()),
                          [cell[0] for cell in ws['A1':f'A{len(salaries_by_cities) + 1}']])
@@ -190,10 +293,7 @@ class Report:
             for cell in row:
                 if not cell.value:
                     continue
-                cell.border = Border(top=Side(border_style="thin", color="000000"),
-                                     left=Side(border_style="thin", color="000000"),
-                                     right=Side(border_style="thin", color="000000"),
-                                     bottom=Side(border_style="thin", color="000000"))
+                cell.border = THIN_BORDER
                 if is_first_row:
                     cell.font = Font(bold=True)
             is_first_row = False
@@ -225,19 +325,36 @@ class Report:
         :param file_name: Название для сохранения изображения.
         :param show_result: Показывать ли изображение после генерации. По-умолчанию False.
         """
+        if not show_result:
+            with open(file_name, "wb") as file:
+                file.write(self.render_image())
+            return
         self.draw_graphs()
         plt.tight_layout()
         plt.savefig(file_name, dpi=300)
-        if show_result:
-            plt.show()
+        plt.show()
+        plt.close("all")
+
+    def render_image(self, image_format: str = "png", dpi: int = 300) -> bytes:
+        """
+        Рисует графики в память, без файла на диске, на общей для процесса фигуре ChartRenderer.
 
-    def draw_graphs(self) -> None:
+        :param image_format: 'png' или 'svg'.
+        :param dpi: Разрешение PNG-изображения.
+        :returns: Содержимое изображения.
+        """
+        return get_chart_renderer().render(self, image_format, dpi)
+
+    def draw_graphs(self, axes: list = None) -> None:
         """
         Рисует 4 графика на сетке 2x2. Каждый график строится на основании данных каждого ключа из data.
 
+        :param axes: 4 готовые оси. По-умолчанию создаётся новая фигура pyplot.
         """
-        # figure, (ax1, ax2) = plt.subplots(2)
-        figure, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2)
+        if axes is None:
+            figure, axes = plt.subplots(2, 2)
+            axes = axes.flatten()
+        ax1, ax2, ax3, ax4 = axes
         self.draw_bar_graph(ax1, "Уровень зарплат по годам")
         self.draw_bar_graph(ax2, "Количество вакансий по годам")
         self.draw_invert_bar_graph(ax3, "Уровень зарплат по городам")
@@ -313,51 +430,131 @@ class Report:
     # endregion
     # region PDF
 
-    def generate_pdf(self, name: str):
+    def generate_pdf(self, name: str, executor: ProcessPoolExecutor = None, engine: str = "fpdf",
+                     cache: ArtifactCache = None, image_format: str = "png", draft: bool = False) -> Future or None:
+        """
+        Генерирует PDF-файл и Excel-файл с тем же именем на основании данных из DataSet - data.
+        Изображение и Excel-файл строятся параллельно в пуле процессов, PDF ждёт только изображение, Excel-файл
+        дописывается параллельно с PDF. Изображение передаётся в PDF из памяти, на диск оно не пишется, поэтому
+        отчёты с разными именами можно строить одновременно в одной папке.
+
+        :param name: Название сохраняемого PDF-файла с явно указанным расширением.
+        :param executor: Пул процессов для изображения и Excel-файла. По-умолчанию создаётся пул на 2 процесса.
+        :param engine: 'fpdf' - PDF собирается в текущем процессе через PdfWriter, 'html' - разметка pdf_template.html
+            передаётся в wkhtmltopdf через pdfkit.
+        :param cache: Кэш файлов отчёта. Если статистика, профессия, шаблон и engine не изменились, файлы берутся из
+            кэша без генерации.
+        :param image_format: Формат графиков в PDF: 'png' или 'svg'.
+        :param draft: Черновой режим: PDF сразу строится с графиками в DRAFT_DPI, а PDF в полном качестве строится
+            в пуле в фоне и атомарно заменяет черновик.
+        :returns: В черновом режиме - Future фоновой замены черновика, иначе None.
+        """
+        if engine not in ("fpdf", "html"):
+            raise ValueError(f"Неизвестный способ генерации PDF: {engine}")
+        excel_file_name = f"{os.path.splitext(name)[0]}.xlsx"
+        targets = {".xlsx": excel_file_name, ".pdf": name}
+        key = None
+        if cache is not None:
+            key = get_report_key(self.data, self.profession_query, "pdf_template.html",
+                                 {"engine": engine, "image_format": image_format})
+            if cache.restore(key, targets):
+                return None
+            cache.detach(targets)
+
+        own_executor = executor is None
+        if own_executor:
+            executor = ProcessPoolExecutor(max_workers=2)
+        upgrade = None
+        try:
+            image = executor.submit(render_report_image, self.data, self.profession_query, image_format,
+                                    DRAFT_DPI if draft else 300)
+            excel = executor.submit(generate_report_excel, self.data, self.profession_query, excel_file_name)
+            self.write_pdf_file(name, image, engine, image_format)
+            excel.result()
+            if draft:
+                upgrade = executor.submit(upgrade_report_pdf, self.data, self.profession_query, name, engine,
+                                          image_format, cache, key)
+        finally:
+            if own_executor:
+                executor.shutdown(wait=not draft)
+        if cache is not None and not draft:
+            cache.store(key, targets)
+        return upgrade
+
+    def write_pdf_file(self, name: str, image: Future, engine: str = "fpdf", image_format: str = "png") -> None:
+        """
+        Собирает PDF-файл выбранным способом.
+
+        :param name: Название сохраняемого PDF-файла с явно указанным расширением.
+        :param image: Future с содержимым изображения, результат render_report_image.
+        :param engine: 'fpdf' или 'html'.
+        :param image_format: 'png' или 'svg'.
+        """
+        if engine == "html":
+            pdf_template = self.render_html(image.result(), image_format)
+            config = pdfkit.configuration(wkhtmltopdf=r'D:\Programs\wkhtmltopdf\bin\wkhtmltopdf.exe')
+            pdfkit.from_string(pdf_template, name, configuration=config)
+        else:
+            self.write_pdf(name, image)
+
+    def get_table_rows(self) -> tuple:
+        """
+        Возвращает строки таблиц отчёта в порядке столбцов: (год, средняя зарплата, зарплата профессии, количество
+        вакансий, количество вакансий профессии) и (город, уровень зарплат, город, доля вакансий в процентах).
+        """
+        salaries_by_years, profession_salaries_by_years = self.data["Уровень зарплат по годам"]
+        vacancies_by_years, profession_vacancies_by_years = self.data["Количество вакансий по годам"]
+        salaries_by_cities = self.data["Уровень зарплат по городам"]
+        ratio_vacancy_by_cities = {city: str(f'{ratio * 100:,.2f}%').replace('.', ',')
+                                   for city, ratio in self.data["Доля вакансий по городам"].items()}
+
+        year_rows = [list(row) for row in zip(salaries_by_years.keys(), salaries_by_years.values(),
+                                              profession_salaries_by_years.values(), vacancies_by_years.values(),
+                                              profession_vacancies_by_years.values())]
+        city_rows = [list(row) for row in zip(salaries_by_cities.keys(), salaries_by_cities.values(),
+                                              ratio_vacancy_by_cities.keys(), ratio_vacancy_by_cities.values())]
+        return year_rows, city_rows
+
+    def write_pdf(self, name: str, image) -> None:
         """
-        Генерирует PDF-файл на основании данных из DataSet - data и разметки PDF - pdf_template.html.
+        Собирает PDF-файл через PdfWriter. Документ, шрифты и строки таблиц готовятся, пока строится изображение.
 
         :param name: Название сохраняемого PDF-файла с явно указанным расширением.
+        :param image: Future с содержимым изображения, результат render_report_image.
         """
+        year_rows, city_rows = self.get_table_rows()
+        header_year = ["Год", "Средняя зарплата", f"Средняя зарплата - {self.profession_name}",
+                       "Количество вакансий", f"Количество вакансий - {self.profession_name}"]
+        writer = PdfWriter(f"Аналитика по зарплатам и городам для профессии {self.profession_name}")
 
-        excel_file_name = "report.xlsx"
-        image_file_name = "graph.png"
-        self.generate_image(image_file_name)
-        self.generate_excel(excel_file_name)
+        writer.add_image(BytesIO(image.result()))
+        writer.add_table("Статистика по годам", header_year, year_rows, (10, 15, 30, 15, 30))
+        writer.add_table("Статистика по городам", ["Город", "Уровень зарплат", "Город", "Доля вакансий"],
+                         city_rows, (20, 20, 20, 20))
+        writer.save(name)
+
+    def render_html(self, image: bytes, image_format: str = "png") -> str:
+        """
+        Рендерит разметку PDF-файла по шаблону pdf_template.html. Изображение встраивается в разметку как data URI.
 
-        image_file = os.path.join(os.path.dirname(name), image_file_name)
+        :param image: Содержимое изображения с графиками.
+        :param image_format: 'png' или 'svg'.
+        :returns: HTML-разметка отчёта.
+        """
         header_year = ["Год", "Средняя зарплата", f"Средняя зарплата - {self.profession_name}",
                        "Количество вакансий",
                        f"Количество вакансий - {self.profession_name}"]
         header_city = ["Город", "Уровень зарплат", '', "Город", "Доля вакансий"]
 
-        env = Environment(loader=FileSystemLoader('.'))
-        template = env.get_template("pdf_template.html")
-
-        salaries_by_years = self.data["Уровень зарплат по годам"][0]
-        vacancies_by_years = self.data["Количество вакансий по годам"][0]
-        profession_salaries_by_years = self.data["Уровень зарплат по годам"][1]
-        profession_vacancies_by_years = self.data["Количество вакансий по годам"][1]
-        salaries_by_cities = self.data["Уровень зарплат по городам"]
-        ratio_vacancy_by_cities = {city: str(f'{ratio * 100:,.2f}%').replace('.', ',')
-                                   for city, ratio in self.data["Доля вакансий по городам"].items()}
+        template = get_template("pdf_template.html")
 
+        year_rows, city_rows = self.get_table_rows()
         salary_data = {year: [salary, count, salary_vac, count_vac]
-                       for year, salary, count, salary_vac, count_vac in zip(salaries_by_years.keys(),
-                                                                             salaries_by_years.values(),
-                                                                             vacancies_by_years.values(),
-                                                                             profession_salaries_by_years.values(),
-                                                                             profession_vacancies_by_years.values())}
-
-        city_data = {index: [salary_city, salary, ratio_city, ratio]
-                     for index, (salary_city, salary, ratio_city, ratio) in
-                     enumerate(zip(salaries_by_cities.keys(),
-                                   salaries_by_cities.values(),
-                                   ratio_vacancy_by_cities.keys(),
-                                   ratio_vacancy_by_cities.values()))}
+                       for year, salary, salary_vac, count, count_vac in year_rows}
+        city_data = dict(enumerate(city_rows))
 
         pdf_template = template.render(
-            {'image_file': image_file,
+            {'image_src': get_data_uri(image, image_format),
              'image_style': 'style="max-width:1024px; max-height:680px"',
              'salary_data': salary_data,
              'city_data': city_data,
@@ -369,104 +566,328 @@ class Report:
              'cell_style_none': "style=''",
              'cell_style': 'style="border:1px solid black; border-collapse: collapse; font-size: 16px; height: 19pt;'
                            'padding: 5px; text-align:center"'})
+        return pdf_template
+    # endregion
+    # region HTML
+
+    def render_svg_graphs(self) -> list:
+        """
+        Рисует те же 4 графика, что и draw_graphs, в виде SVG-разметки без matplotlib.
 
-        config = pdfkit.configuration(wkhtmltopdf=r'D:\Programs\wkhtmltopdf\bin\wkhtmltopdf.exe')
-        pdfkit.from_string(pdf_template, name, configuration=config, options={'enable-local-file-access': None})
+        :returns: Список SVG-строк.
+        """
+        salaries, profession_salaries = self.data["Уровень зарплат по годам"]
+        vacancies, profession_vacancies = self.data["Количество вакансий по годам"]
+        ratio_by_cities = self.data["Доля вакансий по городам"]
+        pie_data = {'Другие': 1 - sum(ratio_by_cities.values())}
+        pie_data.update(ratio_by_cities)
+        return [
+            get_bar_chart("Уровень зарплат по годам",
+                          [('средняя з/п', salaries), (f'з/п {self.profession_name}', profession_salaries)]),
+            get_bar_chart("Количество вакансий по годам",
+                          [("Количество вакансий", vacancies),
+                           (f"Количество вакансий {self.profession_name}", profession_vacancies)]),
+            get_horizontal_bar_chart("Уровень зарплат по городам", self.data["Уровень зарплат по городам"]),
+            get_pie_chart("Доля вакансий по городам", pie_data),
+        ]
+
+    def generate_html(self, file_name: str) -> None:
+        """
+        Генерирует самодостаточный HTML-файл с таблицами и SVG-графиками по шаблону html_template.html. Не использует
+        matplotlib, openpyxl и wkhtmltopdf. Разметка пишется в файл потоково.
+
+        :param file_name: Название HTML-файла с явно указанным расширением.
+        """
+        year_rows, city_rows = self.get_table_rows()
+        header_year = ["Год", "Средняя зарплата", f"Средняя зарплата - {self.profession_name}",
+                       "Количество вакансий", f"Количество вакансий - {self.profession_name}"]
+        render_to_file(get_template("html_template.html", autoescape=True),
+                       {'profession_name': self.profession_name,
+                        'charts': self.render_svg_graphs(),
+                        'header_year': header_year,
+                        'year_rows': year_rows,
+                        'city_rows': city_rows},
+                       file_name)
     # endregion
 
 
-def get_salaries_by_years(df: pd.DataFrame) -> dict:
-    return (df
-            .groupby("published_at")["salary"].agg(np.sum)
-            .floordiv(df
-                      .groupby('published_at')['published_at']
-                      .count())
-            .to_dict()
-            )
-
-
-def get_vacancies_count_by_years(df: pd.DataFrame) -> dict:
-    return (
-        df
-        .value_counts("published_at", ascending=True)
-        .sort_index()
-        .to_dict()
-    )
-
-
-def check_substring_in_name(df: pd.DataFrame, name: str) -> pd.DataFrame:
-    return df.loc[
-        df["name"]
-        .apply(lambda s: s.lower())
-        .str.contains(name.lower())
-    ]
-
-
-def get_data_by_years(df: pd.DataFrame, profession_name: str) -> dict:
-    salaries_by_years = df.pipe(get_salaries_by_years)
-    vacancies_count_by_years = df.pipe(get_vacancies_count_by_years)
-    profession_salaries_by_years = check_substring_in_name(df, profession_name).pipe(get_salaries_by_years)
-    profession_vacancies_count_by_years = check_substring_in_name(df, profession_name).pipe(
-        get_vacancies_count_by_years)
-    return {
-        "Уровень зарплат по годам": (salaries_by_years, profession_salaries_by_years),
-        "Количество вакансий по годам": (vacancies_count_by_years, profession_vacancies_count_by_years)
-    }
-
-
-def get_salaries_by_cities(df: pd.DataFrame) -> dict:
-    return (df
-            .groupby("area_name")["salary"].agg(sum)
-            .floordiv(df
-                      .groupby('area_name')['area_name']
-                      .count())
-            .nlargest(10)
-            .to_dict()
-            )
-
-
-def get_cities_more_percent_series(df: pd.DataFrame) -> pd.Series:
-    return (
-        df["area_name"]
-        .value_counts(normalize=True)
-        .loc[lambda x: x > 0.01]
-    )
-
-
-def get_cities_more_percent(df: pd.DataFrame) -> pd.DataFrame:
-    return df.loc[
-        df["area_name"].isin(
-            df.pipe(get_cities_more_percent_series)
-            .index)
-    ]
-
-
-def get_data_by_cities(df: pd.DataFrame) -> dict:
-    salaries_by_cities = get_salaries_by_cities(df.pipe(get_cities_more_percent))
-    ratio_vacancies_by_cities = (df
-                                 .pipe(get_cities_more_percent_series)
-                                 .nlargest(10)
-                                 .to_dict()
-                                 )
-
-    return {
-        "Уровень зарплат по городам": salaries_by_cities,
-        "Доля вакансий по городам": ratio_vacancies_by_cities
-    }
+def get_data_uri(content: bytes, image_format: str) -> str:
+    """
+    Возвращает data URI изображения для встраивания в HTML.
+
+    >>> get_data_uri(b'<svg/>', 'svg')
+    'data:image/svg+xml;base64,PHN2Zy8+'
+    """
+    media_type = "image/svg+xml" if image_format == "svg" else f"image/{image_format}"
+    return f"data:{media_type};base64,{b64encode(content).decode('ascii')}"
+
+
+def render_report_image(data: dict, profession_name: str, image_format: str = "png", dpi: int = 300) -> bytes:
+    """
+    Строит изображение с графиками в рабочем процессе и возвращает его содержимое.
+    """
+    return Report(data, profession_name).render_image(image_format, dpi)
+
+
+def upgrade_report_pdf(data: dict, profession_name: str, name: str, engine: str = "fpdf",
+                       image_format: str = "png", cache: ArtifactCache = None, key: str = None) -> str:
+    """
+    Фоновая часть чернового режима generate_pdf: строит PDF в полном качестве во временный файл и атомарно заменяет
+    им черновик, после чего сохраняет отчёт в кэш, если он передан.
+
+    :returns: Путь до PDF-файла.
+    """
+    report = Report(data, profession_name)
+    temporary = f"{name}.{os.getpid()}.tmp"
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        image = executor.submit(report.render_image, image_format)
+        report.write_pdf_file(temporary, image, engine, image_format)
+    os.replace(temporary, name)
+    if cache is not None:
+        cache.store(key, {".xlsx": f"{os.path.splitext(name)[0]}.xlsx", ".pdf": name})
+    return name
+
+
+def generate_report_excel(data: dict, profession_name: str, file_name: str) -> str:
+    """
+    Строит Excel-файл в рабочем процессе.
+
+    :returns: Путь до Excel-файла.
+    """
+    Report(data, profession_name).generate_excel(file_name)
+    return file_name
+
+
+def get_fuzzy_index(ui: UserInput, variants_limit: int = 20) -> TrigramIndex or None:
+    """
+    Предлагает похожие названия вакансий, если точных совпадений нет. Триграммный индекс сохраняется рядом
+    с CSV-файлом и строится заново, только когда файл изменился.
+    """
+    index = TrigramIndex.for_file(ui.file_name)
+    matched_names = index.get_matched_names(ui.profession_name)
+    if matched_names.empty:
+        return None
+
+    print("Точных совпадений нет, похожие названия вакансий:")
+    for name, similarity in matched_names.head(variants_limit).items():
+        print(f"  {name} ({similarity:.0%})")
+    if len(matched_names) > variants_limit:
+        print(f"  ... и ещё {len(matched_names) - variants_limit}")
+    return index if ui.confirm("Использовать эти вакансии?") else None
+
+
+def get_region(ui: UserInput) -> str or None:
+    """
+    Возвращает регион ввода, которым ограничивается статистика по годам во всех источниках данных. Статистика по
+    городам - по всей стране, как в пакетном режиме.
+
+    >>> get_region(UserInput('f.csv', 'IT', 'Москва')), get_region(UserInput('f.csv', 'IT', ''))
+    ('Москва', None)
+    """
+    return ui.area_name or None
+
+
+def read_vacancies(ui: UserInput) -> pd.DataFrame:
+    df = load_vacancies(ui.file_name, year=False)
+    return add_year(slice_period(df, ui.date_from, ui.date_to))
+
+
+def get_data_from_file(ui: UserInput) -> dict:
+    df = read_vacancies(ui)
+    index = NameIndex.for_file(ui.file_name)
+    if len(index.search(ui.profession_name)) == 0:
+        index = get_fuzzy_index(ui) or index
+    return get_statistics(df, ui.profession_name, index, get_region(ui))
+
+
+def get_data_from_chunks(ui: UserInput) -> dict:
+    """
+    Считает статистику по CSV-файлу частями, не загружая его целиком. Период отбирается в каждой части, поиск
+    профессии - по подстроке, без NameIndex и нечёткого поиска.
+    """
+    def get_period(chunk: pd.DataFrame) -> pd.DataFrame:
+        return add_year(slice_period(chunk, ui.date_from, ui.date_to))
+
+    return aggregate_chunks(map(get_period, iter_vacancies(ui.file_name, year=False)), ui.profession_name,
+                            region=get_region(ui))
+
+
+def get_year_range(ui: UserInput) -> (int or None, int or None):
+    """
+    Округляет период ввода до целых лет: (первый год, последний год) включительно.
+    """
+    year_from = None if ui.date_from is None else pd.Timestamp(ui.date_from).year
+    year_to = None if ui.date_to is None else (pd.Timestamp(ui.date_to) - pd.Timedelta(seconds=1)).year
+    return year_from, year_to
+
+
+def get_data_from_partitions(ui: UserInput) -> dict:
+    """
+    Считает статистику по папке партиций из Partitions.py. Партиции вне периода не читаются, вакансии на границах
+    периода отбираются по дате публикации, как в get_data_from_file.
+    """
+    return aggregate_partitions(ui.file_name, ui.profession_name, ui.date_from, ui.date_to, get_region(ui))
+
+
+def get_data_from_parquet(ui: UserInput) -> dict:
+    """
+    Считает статистику по Parquet-набору из Partitions.partition_parquet. Отбор лет периода и региона выполняется
+    при чтении, вакансии на границах периода отбираются по дате публикации, как в get_data_from_file. Для
+    статистики по городам по всей стране читаются только столбцы salary, area_name и published_at.
+    """
+    period = ui.date_from is not None or ui.date_to is not None
+    year_from, year_to = get_year_range(ui)
+    region = get_region(ui)
+
+    def read(columns: list = None, area_name: str = None) -> pd.DataFrame:
+        df = load_parquet(ui.file_name, columns, year=not period, area_name=area_name, year_from=year_from,
+                          year_to=year_to)
+        return add_year(slice_period(df, ui.date_from, ui.date_to)) if period else df
+
+    partial = get_partial_statistics(read(area_name=region), ui.profession_name)
+    if region is not None:
+        partial["cities"] = get_city_statistics(read(["salary", "area_name", "published_at"]))
+    return finalize_statistics(partial)
+
+
+def is_whole_years(ui: UserInput) -> bool:
+    """
+    Проверяет, что границы периода - начала лет, то есть округление периода до целых лет не меняет отбор вакансий.
+
+    >>> is_whole_years(UserInput('f.csv', 'IT', 'Москва', '2021-01-01', '2023-01-01'))
+    True
+    >>> is_whole_years(UserInput('f.csv', 'IT', 'Москва', '2021-06-01'))
+    False
+    """
+    for date in (ui.date_from, ui.date_to):
+        if date is not None:
+            timestamp = pd.Timestamp(date).tz_localize(None)
+            if timestamp != pd.Timestamp(timestamp.year, 1, 1):
+                return False
+    return True
+
+
+def get_data_from_cube(ui: UserInput) -> dict or None:
+    """
+    Считает статистику по сохранённому кубу агрегатов (Cube.py) без чтения вакансий, если куб даёт тот же результат,
+    что и источник, который он заменяет: регион ограничивает статистику по годам, как в get_region, а период должен
+    состоять из целых лет.
+
+    :returns: Словарь для Report или None, если запрос не из меток Taxonomy, актуального куба нет, период нельзя
+        точно посчитать по кубу или вакансий профессии нет (тогда get_data_from_file предложит нечёткий поиск).
+    """
+    taxonomy = Taxonomy()
+    if not taxonomy.is_label_query(ui.profession_name):
+        return None
+    if not is_whole_years(ui):
+        return None
+    cube = Cube.for_file(ui.file_name, taxonomy, build=False)
+    if cube is None:
+        return None
+    data = cube.get_statistics(ui.profession_name, get_region(ui), *get_year_range(ui))
+    return data if data["Количество вакансий по годам"][1] else None
+
+
+def render_shared_report(spec: dict, profession_name: str, directory: str) -> str:
+    """
+    Строит отчёт по одной профессии в рабочем процессе по данным из общей памяти.
+
+    :param spec: Описание блоков общей памяти SharedColumns.
+    :param profession_name: Название профессии, можно несколько через разделитель '|'.
+    :param directory: Папка для файлов отчёта.
+    :returns: Путь до файлов отчёта без расширения.
+    """
+    shared = SharedColumns.attach(spec)
+    try:
+        df = shared.to_frame()
+        data = finalize_statistics(get_partial_statistics(df, profession_name))
+        del df
+    finally:
+        shared.close()
+
+    file_name = os.path.join(directory, re.sub(r"\W+", "_", profession_name))
+    report = Report(data, profession_name)
+    report.generate_excel(f"{file_name}.xlsx")
+    report.generate_image(f"{file_name}.png")
+    return file_name
+
+
+def generate_reports_in_parallel(df: pd.DataFrame, professions: list, directory: str, processes: int = None) -> list:
+    """
+    Публикует столбцы датасета в общую память один раз и строит отчёты по профессиям в пуле процессов. Рабочие
+    процессы не перечитывают CSV-файл и не копируют данные.
+
+    :param df: Датасет с годом в столбце published_at.
+    :param professions: Список запросов профессий.
+    :param directory: Папка для файлов отчётов.
+    :param processes: Количество процессов. По-умолчанию - по числу ядер.
+    :returns: Пути до файлов отчётов без расширения.
+    """
+    os.makedirs(directory, exist_ok=True)
+    with SharedColumns.publish(df, ["name", "salary", "area_name", "published_at"]) as shared:
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            return list(executor.map(render_shared_report, repeat(shared.spec), professions, repeat(directory)))
+
+
+def render_batch_report(data: dict, profession_name: str, region: str or None, directory: str) -> str:
+    """
+    Строит PDF- и Excel-файл одной пары (профессия, регион) в рабочем процессе. Изображение и Excel-файл строятся
+    в потоках этого процесса, чтобы не запускать вложенный пул процессов.
+
+    :returns: Путь до PDF-файла.
+    """
+    label = profession_name if region is None else f"{profession_name}_{region}"
+    file_name = os.path.join(directory, re.sub(r"\W+", "_", label) + ".pdf")
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        Report(data, profession_name).generate_pdf(file_name, executor=executor)
+    return file_name
+
+
+def generate_batch_reports(df: pd.DataFrame, combinations: list, directory: str, processes: int = None) -> list:
+    """
+    Пакетный режим: статистика по всем парам (профессия, регион) считается по одному загруженному датасету через
+    get_batch_data, отчёты строятся в пуле процессов.
+
+    :param df: Датасет с годом в столбце published_at.
+    :param combinations: Список пар (профессия, регион), например product(профессии, регионы).
+    :param directory: Папка для файлов отчётов.
+    :param processes: Количество процессов. По-умолчанию - по числу ядер.
+    :returns: Пути до PDF-файлов в порядке combinations.
+    """
+    os.makedirs(directory, exist_ok=True)
+    batch_data = get_batch_data(df, combinations)
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        futures = [executor.submit(render_batch_report, batch_data[(profession_name, region)], profession_name,
+                                   region, directory)
+                   for profession_name, region in combinations]
+        return [future.result() for future in futures]
+
+
+def get_data(ui: UserInput) -> dict:
+    """
+    Выбирает источник статистики: актуальный куб агрегатов, Parquet-набор, папку партиций, чтение большого CSV-файла
+    частями или целиком.
+    """
+    data = get_data_from_cube(ui)
+    if data is not None:
+        return data
+    if ui.file_name.endswith(PARQUET_SUFFIX):
+        return get_data_from_parquet(ui)
+    if os.path.isdir(ui.file_name):
+        return get_data_from_partitions(ui)
+    if is_large_file(ui.file_name):
+        return get_data_from_chunks(ui)
+    return get_data_from_file(ui)
 
 
 def main() -> None:
     hh_ru = "../API/hh_ru_joined_salary.csv"
     big = "vacancies_joined_salary.csv"
     ui = UserInput(big, "Программист|IT|Senior|Middle|Junior|Аналитик", "Москва")
-    df = pd.read_csv(ui.file_name, dtype={"name": "str", "salary": "Int64", "area_name": "str"}, verbose=True)
-    df = df.assign(published_at=df['published_at'].apply(lambda s: dt.datetime.fromisoformat(s).year).astype("int32"))
-
-    data = get_data_by_years(df, ui.profession_name)
-    data.update(df.pipe(get_data_by_cities))
+    data = get_data(ui)
 
     report = Report(data, ui.profession_name)
-    report.generate_pdf("report.pdf")
+    report.generate_pdf("report.pdf", cache=ArtifactCache())
 
 
 if __name__ == "__main__":
@@ -0,0 +1,183 @@
+import numpy as np
+import pandas as pd
+
+from NameMasks import NameMasks
+
+
+def get_profession_mask(df: pd.DataFrame, profession_name: str, index=None) -> np.ndarray:
+    """
+    Считает маску вакансий профессии один раз для всей статистики.
+
+    :param df: Датасет вакансий.
+    :param profession_name: Название профессии, можно несколько через разделитель '|'.
+    :param index: NameIndex, LabelIndex, TrigramIndex или NameMasks. Метод search индекса возвращает метки строк
+        df (индекс DataFrame), а не позиции, поэтому индекс можно применять к отобранной части датасета. Без индекса
+        используются общие для df NameMasks.
+
+    >>> get_profession_mask(pd.DataFrame({'name': ['Программист', 'Водитель', None]}), 'программист')
+    array([ True, False, False])
+    """
+    if index is None:
+        index = NameMasks.for_frame(df)
+    if isinstance(index, NameMasks):
+        return index.get_mask(profession_name)
+    return df.index.isin(index.search(profession_name))
+
+
+def get_partial_statistics(df: pd.DataFrame, profession_name: str, index=None, region: str = None) -> dict:
+    """
+    Считает суммы зарплат и количества вакансий, из которых складывается статистика по годам и городам. Маска
+    профессии считается один раз, на каждый ключ группировки - один groupby().agg: общие и профессиональные суммы
+    по годам считаются вместе. Частичные результаты разных частей датасета можно сложить через
+    merge_partial_statistics.
+
+    :param df: Часть датасета с годом в столбце published_at.
+    :param profession_name: Название профессии, можно несколько через разделитель '|'.
+    :param index: NameIndex или LabelIndex для поиска профессии.
+    :param region: Регион для статистики по годам. Статистика по городам - по всей стране, как в get_batch_data.
+        None - вся страна.
+    :returns: {'years': DataFrame, 'profession_years': DataFrame, 'cities': DataFrame} со столбцами salary и count.
+    """
+    mask = get_profession_mask(df, profession_name, index)
+    cities = get_city_statistics(df)
+    if region is not None:
+        in_region = (df["area_name"] == region).to_numpy(dtype=bool)
+        df, mask = df.loc[in_region], mask[in_region]
+    years = (df
+             .assign(profession_salary=df["salary"].where(mask, 0), profession_count=mask)
+             .groupby("published_at", observed=True)
+             .agg(salary=("salary", "sum"), count=("published_at", "size"),
+                  profession_salary=("profession_salary", "sum"), profession_count=("profession_count", "sum"))
+             )
+    profession_years = (years
+                        .loc[years["profession_count"] > 0, ["profession_salary", "profession_count"]]
+                        .rename(columns={"profession_salary": "salary", "profession_count": "count"})
+                        )
+    return {
+        "years": years[["salary", "count"]],
+        "profession_years": profession_years,
+        "cities": cities,
+    }
+
+
+def get_city_statistics(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Считает суммы зарплат и количества вакансий по городам. Нужны только столбцы salary и area_name.
+
+    :returns: DataFrame со столбцами salary и count, индекс - area_name.
+    """
+    return (df
+            .groupby("area_name", observed=True)
+            .agg(salary=("salary", "sum"), count=("area_name", "size"))
+            )
+
+
+def get_statistics(df: pd.DataFrame, profession_name: str, index=None, region: str = None) -> dict:
+    """
+    Считает всю статистику отчёта по годам и городам за один проход по датасету.
+
+    :param df: Датасет с годом в столбце published_at.
+    :param profession_name: Название профессии, можно несколько через разделитель '|'.
+    :param index: NameIndex или LabelIndex для поиска профессии.
+    :param region: Регион для статистики по годам. None - вся страна.
+    :returns: Словарь для Report.
+    """
+    return finalize_statistics(get_partial_statistics(df, profession_name, index, region))
+
+
+def aggregate_chunks(chunks, profession_name: str, get_index=None, region: str = None) -> dict:
+    """
+    Считает статистику по частям датасета, не держа его в памяти целиком: частичные суммы каждой части сразу
+    складываются с накопленными. Порог в 1% и выбор 10 городов применяются после объединения, поэтому результат
+    совпадает с get_statistics по всему датасету.
+
+    :param chunks: Итератор частей датасета, например Loader.iter_vacancies.
+    :param profession_name: Название профессии, можно несколько через разделитель '|'.
+    :param get_index: Функция, строящая индекс профессии для части. По-умолчанию - NameMasks части.
+    :param region: Регион для статистики по годам. None - вся страна.
+    :returns: Словарь для Report.
+    """
+    partial = None
+    for chunk in chunks:
+        chunk_partial = get_partial_statistics(chunk, profession_name, get_index and get_index(chunk), region)
+        partial = chunk_partial if partial is None else merge_partial_statistics([partial, chunk_partial])
+    if partial is None:
+        raise ValueError("Нет данных для статистики")
+    return finalize_statistics(partial)
+
+
+def merge_partial_statistics(partials: list) -> dict:
+    """
+    Складывает частичные результаты get_partial_statistics.
+    """
+    return {key: (pd.concat([partial[key] for partial in partials])
+                  .groupby(level=0)
+                  .sum())
+            for key in ("years", "profession_years", "cities")}
+
+
+def finalize_statistics(partial: dict) -> dict:
+    """
+    Превращает суммы и количества в словари, которые принимает Report. Порог в 1% и выбор 10 городов применяются
+    только здесь, после объединения частей.
+
+    :param partial: Результат get_partial_statistics или merge_partial_statistics.
+    :returns: Словарь для Report.
+    """
+    years = partial["years"].sort_index()
+    profession_years = partial["profession_years"].sort_index()
+    cities = partial["cities"].sort_index()
+
+    ratio_by_cities = cities["count"] / cities["count"].sum()
+    relevant_cities = cities.loc[ratio_by_cities > 0.01]
+
+    return {
+        "Уровень зарплат по годам": ((years["salary"] // years["count"]).to_dict(),
+                                     (profession_years["salary"] // profession_years["count"]).to_dict()),
+        "Количество вакансий по годам": (years["count"].to_dict(), profession_years["count"].to_dict()),
+        "Уровень зарплат по городам": (relevant_cities["salary"] // relevant_cities["count"]).nlargest(10).to_dict(),
+        "Доля вакансий по городам": ratio_by_cities.loc[lambda x: x > 0.01].nlargest(10).to_dict(),
+    }
+
+
+def get_batch_data(df: pd.DataFrame, combinations: list) -> dict:
+    """
+    Считает статистику для набора пар (профессия, регион) за один проход по группировкам. Суммы по (региону, году)
+    для всех вакансий и статистика по городам считаются один раз, для каждой профессии - одна маска и одна
+    группировка, срезы по регионам берутся из неё.
+
+    :param df: Датасет с годом в столбце published_at.
+    :param combinations: Список пар (профессия, регион). Регион None - вся страна.
+    :returns: {(профессия, регион): словарь для Report}. Статистика по годам - в пределах региона, по городам - общая.
+    """
+    def aggregate(frame: pd.DataFrame) -> pd.DataFrame:
+        return (frame
+                .groupby(["area_name", "published_at"], observed=True)
+                .agg(salary=("salary", "sum"), count=("salary", "size"))
+                )
+
+    def get_region(grouped: pd.DataFrame, region: str or None) -> pd.DataFrame:
+        if region is None:
+            return grouped.groupby(level="published_at").sum()
+        if region not in grouped.index.get_level_values("area_name"):
+            return grouped.iloc[:0].droplevel("area_name")
+        return grouped.xs(region, level="area_name")
+
+    all_vacancies = aggregate(df)
+    cities = all_vacancies.groupby(level="area_name").sum()
+    masks = NameMasks.for_frame(df)
+
+    data = {}
+    regions_by_professions = {}
+    for profession_name, region in combinations:
+        regions_by_professions.setdefault(profession_name, []).append(region)
+    for profession_name, regions in regions_by_professions.items():
+        mask = masks.get_mask(profession_name)
+        profession_vacancies = aggregate(df.loc[mask])
+        for region in regions:
+            data[(profession_name, region)] = finalize_statistics({
+                "years": get_region(all_vacancies, region),
+                "profession_years": get_region(profession_vacancies, region),
+                "cities": cities,
+            })
+    return data
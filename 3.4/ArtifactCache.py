@@ -0,0 +1,100 @@
+import hashlib
+import json
+import os
+import shutil
+
+CACHE_VERSION = 1
+
+
+def get_report_key(data: dict, profession_name: str, template_file: str = None, options: dict = None) -> str:
+    """
+    Считает ключ отчёта: хэш словаря статистики, запроса профессии, содержимого шаблона и параметров генерации.
+    Порядок ключей словарей учитывается, потому что от него зависит порядок строк и столбцов в отчёте.
+
+    :param data: Словарь статистики, который принимает Report.
+    :param profession_name: Запрос профессии.
+    :param template_file: Путь до шаблона разметки. Несуществующий файл не учитывается.
+    :param options: Параметры генерации, влияющие на файлы отчёта.
+
+    >>> data = {'Уровень зарплат по городам': {'Москва': 100, 'Пермь': 50}}
+    >>> get_report_key(data, 'IT') == get_report_key(data, 'IT')
+    True
+    >>> get_report_key(data, 'IT') == get_report_key({'Уровень зарплат по городам': {'Пермь': 50, 'Москва': 100}}, 'IT')
+    False
+    """
+    digest = hashlib.sha256()
+    payload = [CACHE_VERSION, profession_name, [[key, value] for key, value in data.items()], options or {}]
+    digest.update(json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8"))
+    if template_file is not None and os.path.exists(template_file):
+        with open(template_file, "rb") as file:
+            digest.update(file.read())
+    return digest.hexdigest()
+
+
+class ArtifactCache:
+    """
+    Кэш файлов отчёта по ключу get_report_key: directory/<ключ><расширение>. Файлы переносятся в кэш и обратно жёсткими
+    ссылками, если файловая система их поддерживает, иначе копируются.
+
+    Attributes
+    ----------
+    directory : str
+        Папка кэша.
+    """
+
+    directory: str
+
+    def __init__(self, directory: str = ".report_cache"):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def get_path(self, key: str, suffix: str) -> str:
+        return os.path.join(self.directory, f"{key}{suffix}")
+
+    @staticmethod
+    def _link(source: str, destination: str) -> None:
+        # rename между двумя ссылками на один файл ничего не делает и оставляет временный файл
+        if os.path.exists(destination) and os.path.samefile(source, destination):
+            return
+        temporary = f"{destination}.{os.getpid()}.tmp"
+        try:
+            os.link(source, temporary)
+        except OSError:
+            shutil.copyfile(source, temporary)
+        os.replace(temporary, destination)
+
+    def restore(self, key: str, targets: dict) -> bool:
+        """
+        Восстанавливает файлы отчёта из кэша, если в нём есть все нужные.
+
+        :param key: Ключ отчёта.
+        :param targets: {расширение в кэше: путь до файла отчёта}.
+        :returns: True, если все файлы взяты из кэша.
+        """
+        if not all(os.path.exists(self.get_path(key, suffix)) for suffix in targets):
+            return False
+        for suffix, file_name in targets.items():
+            self._link(self.get_path(key, suffix), file_name)
+        return True
+
+    @staticmethod
+    def detach(targets: dict) -> None:
+        """
+        Удаляет старые файлы отчёта перед генерацией. Они могут быть жёсткими ссылками на файлы кэша, и запись поверх
+        них испортила бы кэш.
+
+        :param targets: {расширение в кэше: путь до файла отчёта}.
+        """
+        for file_name in targets.values():
+            if os.path.exists(file_name):
+                os.remove(file_name)
+
+    def store(self, key: str, targets: dict) -> None:
+        """
+        Сохраняет сгенерированные файлы отчёта в кэш.
+
+        :param key: Ключ отчёта.
+        :param targets: {расширение в кэше: путь до файла отчёта}.
+        """
+        for suffix, file_name in targets.items():
+            self._link(file_name, self.get_path(key, suffix))
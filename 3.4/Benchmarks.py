@@ -0,0 +1,172 @@
+import importlib.util
+import json
+import os
+import sys
+import time
+import tracemalloc
+from argparse import ArgumentParser
+from concurrent.futures import ThreadPoolExecutor
+from tempfile import TemporaryDirectory
+
+import numpy as np
+
+DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+BASELINE_FILE = os.path.join(DIRECTORY, "benchmarks.json")
+SIZES = {
+    "small": {"years": 16, "cities": 10, "professions": 1},
+    "medium": {"years": 50, "cities": 100, "professions": 5},
+    "large": {"years": 200, "cities": 1000, "professions": 20},
+}
+
+
+def load_report_module():
+    spec = importlib.util.spec_from_file_location("report_3_4_3", os.path.join(DIRECTORY, "3.4.3.py"))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def get_statistics(years: int, cities: int, professions: int, seed: int = 0) -> tuple:
+    """
+    Создаёт синтетический словарь статистики в формате Report и запрос из professions профессий.
+
+    >>> data, profession_name = get_statistics(3, 2, 2)
+    >>> len(data['Уровень зарплат по годам'][0]), len(data['Доля вакансий по городам']), profession_name
+    (3, 2, 'Профессия 0|Профессия 1')
+    """
+    random = np.random.default_rng(seed)
+
+    def get_values(keys: list, low: int, high: int) -> dict:
+        return {key: int(value) for key, value in zip(keys, random.integers(low, high, len(keys)))}
+
+    year_keys = list(range(2022 - years + 1, 2023))
+    city_keys = [f"Город {index}" for index in range(cities)]
+    ratios = random.random(cities)
+    data = {
+        "Уровень зарплат по годам": (get_values(year_keys, 30000, 200000), get_values(year_keys, 30000, 300000)),
+        "Количество вакансий по годам": (get_values(year_keys, 1000, 100000), get_values(year_keys, 10, 1000)),
+        "Уровень зарплат по городам": dict(sorted(get_values(city_keys, 30000, 200000).items(),
+                                                  key=lambda item: -item[1])),
+        "Доля вакансий по городам": dict(sorted(zip(city_keys, (ratios / ratios.sum() * 0.9).tolist()),
+                                                key=lambda item: -item[1])),
+    }
+    return data, "|".join(f"Профессия {index}" for index in range(professions))
+
+
+def get_cases(module, directory: str) -> dict:
+    """
+    Возвращает проверяемые способы вывода: {название: функция(data, profession_name)}.
+    """
+    def generate_pdf(data: dict, profession_name: str) -> None:
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            module.Report(data, profession_name).generate_pdf(os.path.join(directory, "report.pdf"), executor)
+
+    return {
+        "excel": lambda data, name: module.Report(data, name).generate_excel(os.path.join(directory, "a.xlsx")),
+        "excel_streaming": lambda data, name: module.Report(data, name).generate_excel(
+            os.path.join(directory, "b.xlsx"), streaming=True),
+        "excel_charts": lambda data, name: module.Report(data, name).generate_excel(
+            os.path.join(directory, "c.xlsx"), streaming=True, charts=True),
+        "image_png": lambda data, name: module.Report(data, name).render_image("png"),
+        "image_svg": lambda data, name: module.Report(data, name).render_image("svg"),
+        "html_svg": lambda data, name: module.Report(data, name).generate_html(os.path.join(directory, "r.html")),
+        "pdf_fpdf": generate_pdf,
+    }
+
+
+def measure(function, data: dict, profession_name: str, repeat: int) -> dict:
+    """
+    Замеряет лучшее время из repeat запусков и пиковую память отдельным запуском под tracemalloc, который сильно
+    замедляет код и исказил бы время.
+
+    :returns: {'seconds': ..., 'peak_mb': ...}.
+    """
+    function(data, profession_name)
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(data, profession_name)
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        function(data, profession_name)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {"seconds": round(min(times), 4), "peak_mb": round(peak / 2 ** 20, 2)}
+
+
+def run(sizes: list, cases: list = None, repeat: int = 3) -> dict:
+    """
+    Прогоняет способы вывода на статистике разных размеров.
+
+    :param sizes: Названия размеров из SIZES.
+    :param cases: Названия способов вывода. По-умолчанию все.
+    :param repeat: Количество замеров времени.
+    :returns: {размер: {способ: {'seconds', 'peak_mb'}}}.
+    """
+    module = load_report_module()
+    results = {}
+    with TemporaryDirectory() as directory:
+        all_cases = get_cases(module, directory)
+        for size in sizes:
+            data, profession_name = get_statistics(**SIZES[size])
+            results[size] = {}
+            for case in cases or list(all_cases):
+                results[size][case] = measure(all_cases[case], data, profession_name, repeat)
+                print(f"{size:>8} {case:<16} {results[size][case]['seconds']:>9.4f} с "
+                      f"{results[size][case]['peak_mb']:>9.2f} МБ")
+    return results
+
+
+def find_regressions(results: dict, baseline: dict, tolerance: float = 1.5) -> list:
+    """
+    Сравнивает результаты с базовыми. Регрессия - время или память больше базовых в tolerance раз.
+
+    >>> find_regressions({'small': {'excel': {'seconds': 0.3, 'peak_mb': 1.0}}},
+    ...                  {'small': {'excel': {'seconds': 0.1, 'peak_mb': 1.0}}})
+    ['small/excel: seconds 0.1 -> 0.3']
+    """
+    regressions = []
+    for size, cases in results.items():
+        for case, metrics in cases.items():
+            expected = baseline.get(size, {}).get(case)
+            if expected is None:
+                continue
+            for metric, value in metrics.items():
+                if value > expected[metric] * tolerance:
+                    regressions.append(f"{size}/{case}: {metric} {expected[metric]} -> {value}")
+    return regressions
+
+
+def main() -> None:
+    parser = ArgumentParser(description="Замеры времени и памяти генерации отчётов Report.")
+    parser.add_argument("--sizes", nargs="+", default=list(SIZES), choices=list(SIZES))
+    parser.add_argument("--cases", nargs="+", default=None)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="JSON-файл с базовыми результатами.")
+    parser.add_argument("--save", action="store_true", help="Записать результаты как базовые.")
+    parser.add_argument("--tolerance", type=float, default=1.5)
+    args = parser.parse_args()
+
+    os.chdir(DIRECTORY)
+    results = run(args.sizes, args.cases, args.repeat)
+    if args.save:
+        with open(args.baseline, "w", encoding="utf-8") as file:
+            json.dump(results, file, ensure_ascii=False, indent=2)
+        return
+    if not os.path.exists(args.baseline):
+        print(f"Нет базовых результатов {args.baseline}, запустите с --save")
+        return
+
+    with open(args.baseline, encoding="utf-8") as file:
+        regressions = find_regressions(results, json.load(file), args.tolerance)
+    for regression in regressions:
+        print(f"Регрессия: {regression}")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
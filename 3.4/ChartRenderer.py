@@ -0,0 +1,76 @@
+from io import BytesIO
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure, SubplotParams
+
+
+class ChartRenderer:
+    """
+    Многоразовая фигура 2x2 для графиков отчёта на бэкенде Agg. Фигура и оси создаются один раз и не регистрируются
+    в pyplot, для каждого отчёта оси очищаются и перерисовываются его данными. Расположение осей (tight_layout)
+    по-умолчанию пересчитывается для каждого отчёта от исходных отступов фигуры, поэтому изображение совпадает с
+    нарисованным на новой фигуре, даже если подписи годов и городов другие.
+
+    Attributes
+    ----------
+    figure : Figure
+        Фигура с холстом Agg.
+    axes : list
+        4 оси в порядке: зарплаты по годам, вакансии по годам, зарплаты по городам, доли городов.
+    relayout : bool
+        Пересчитывать ли tight_layout для каждого отчёта. False - расположение считается по первому отчёту: быстрее,
+        но длинные подписи следующих отчётов могут обрезаться.
+    """
+
+    figure: Figure
+    axes: list
+    relayout: bool
+
+    def __init__(self, relayout: bool = True):
+        self.figure = Figure()
+        FigureCanvasAgg(self.figure)
+        self.axes = list(self.figure.subplots(2, 2).flatten())
+        self.relayout = relayout
+        self._has_layout = False
+
+    def render(self, report, image_format: str = "png", dpi: int = 300) -> bytes:
+        """
+        Рисует графики отчёта и возвращает изображение.
+
+        :param report: Объект Report, его draw_graphs рисует графики на переданных осях.
+        :param image_format: 'png' или 'svg'.
+        :param dpi: Разрешение PNG-изображения.
+        :returns: Содержимое изображения.
+        """
+        for ax in self.axes:
+            ax.clear()
+        report.draw_graphs(self.axes)
+        if self.relayout or not self._has_layout:
+            params = SubplotParams()
+            self.figure.subplots_adjust(left=params.left, right=params.right, bottom=params.bottom, top=params.top,
+                                        wspace=params.wspace, hspace=params.hspace)
+            self.figure.tight_layout()
+            self._has_layout = True
+        buffer = BytesIO()
+        self.figure.savefig(buffer, format=image_format, dpi=dpi)
+        return buffer.getvalue()
+
+    def close(self) -> None:
+        """
+        Освобождает оси и холст фигуры.
+        """
+        self.figure.clear()
+        self.axes = []
+
+
+_renderer = None
+
+
+def get_chart_renderer() -> ChartRenderer:
+    """
+    Возвращает общий на процесс ChartRenderer, чтобы рабочие процессы пакетного режима не создавали фигуру заново.
+    """
+    global _renderer
+    if _renderer is None:
+        _renderer = ChartRenderer()
+    return _renderer
@@ -0,0 +1,216 @@
+import os
+import pickle
+from argparse import ArgumentParser
+
+import numpy as np
+import pandas as pd
+
+from Aggregation import finalize_statistics
+from Loader import PARQUET_SUFFIX, iter_vacancies, load_vacancies
+from Taxonomy import Taxonomy
+
+CUBE_VERSION = 3
+CUBE_SUFFIX = ".cube"
+
+
+class Cube:
+    """
+    Предрассчитанные агрегаты датасета по ячейкам (год, регион, маски меток Taxonomy). В ячейке хранятся сумма
+    зарплат и количество вакансий. Статистика для Report по запросу из меток и любому региону собирается
+    из ячеек, без чтения исходных вакансий.
+
+    Attributes
+    ----------
+    taxonomy : Taxonomy
+        Классификация, по меткам которой построены ячейки.
+    cells : pd.DataFrame
+        Ячейки: published_at, area_name, столбцы меток, salary, count.
+    signature : tuple
+        Размеры и время изменения исходного файла или файлов Parquet-набора, по которым построен куб.
+    """
+
+    taxonomy: Taxonomy
+    cells: pd.DataFrame
+    signature: tuple
+
+    def __init__(self, taxonomy: Taxonomy, cells: pd.DataFrame, signature: tuple = None):
+        self.taxonomy = taxonomy
+        self.cells = cells
+        self.signature = signature
+
+    def __len__(self) -> int:
+        return len(self.cells)
+
+    # region Build
+    @staticmethod
+    def get_keys(taxonomy: Taxonomy) -> list:
+        return ["published_at", "area_name", *taxonomy.labels]
+
+    @classmethod
+    def build(cls, chunks, taxonomy: Taxonomy, signature: tuple = None) -> 'Cube':
+        """
+        Строит куб за один проход по частям датасета: каждая часть классифицируется и сворачивается в ячейки,
+        ячейки частей складываются. Вакансии без региона сохраняются в ячейках с пустым area_name: они входят в
+        статистику по годам, но не по городам, как в get_statistics.
+
+        :param chunks: Итератор частей датасета с годом в столбце published_at.
+        :param taxonomy: Классификация названий вакансий.
+        :param signature: Подпись исходного файла.
+        """
+        keys = cls.get_keys(taxonomy)
+        parts = []
+        for chunk in chunks:
+            parts.append(taxonomy.classify(chunk)
+                         .groupby(keys, observed=True, dropna=False)
+                         .agg(salary=("salary", "sum"), count=("salary", "size"))
+                         .reset_index())
+        cells = (pd.concat(parts, ignore_index=True)
+                 .groupby(keys, observed=True, dropna=False)
+                 .agg(salary=("salary", "sum"), count=("count", "sum"))
+                 .reset_index())
+        return cls(taxonomy, cells.astype({"area_name": "category"}), signature)
+
+    @classmethod
+    def from_file(cls, file_name: str, taxonomy: Taxonomy) -> 'Cube':
+        """
+        Строит куб по CSV-файлу (частями) или Parquet-набору вакансий.
+        """
+        if file_name.endswith(PARQUET_SUFFIX):
+            chunks = [load_vacancies(file_name)]
+        else:
+            chunks = iter_vacancies(file_name)
+        return cls.build(chunks, taxonomy, cls.get_signature(file_name))
+
+    # endregion
+    # region Persistence
+    @staticmethod
+    def get_signature(file_name: str) -> tuple:
+        """
+        Возвращает подпись источника: размер и время изменения CSV-файла или каждого файла Parquet-набора.
+        Перезапись партиций набора не меняет размер и время изменения его папки.
+        """
+        if not os.path.isdir(file_name):
+            stat = os.stat(file_name)
+            return stat.st_size, stat.st_mtime_ns
+        signature = []
+        for directory, _, files in sorted(os.walk(file_name)):
+            for name in sorted(files):
+                stat = os.stat(os.path.join(directory, name))
+                signature.append((os.path.relpath(os.path.join(directory, name), file_name), stat.st_size,
+                                  stat.st_mtime_ns))
+        return tuple(signature)
+
+    @staticmethod
+    def get_cube_file(file_name: str) -> str:
+        return f"{os.path.splitext(file_name)[0]}{CUBE_SUFFIX}"
+
+    @classmethod
+    def for_file(cls, file_name: str, taxonomy: Taxonomy, cube_file: str = None,
+                 build: bool = True) -> 'Cube' or None:
+        """
+        Возвращает сохранённый куб для файла вакансий, если он актуален и построен по тем же правилам, иначе строит
+        и сохраняет новый.
+
+        :param file_name: Путь до CSV-файла или Parquet-набора.
+        :param taxonomy: Классификация названий вакансий.
+        :param cube_file: Путь до файла куба. По-умолчанию рядом с файлом вакансий с расширением .cube.
+        :param build: Строить ли куб, если сохранённого нет. False - вернуть None.
+        """
+        cube_file = cube_file or cls.get_cube_file(file_name)
+        if os.path.exists(cube_file):
+            cube = cls.load(cube_file)
+            if (cube is not None and cube.signature == cls.get_signature(file_name)
+                    and cube.taxonomy.rules == taxonomy.rules):
+                return cube
+        if not build:
+            return None
+
+        cube = cls.from_file(file_name, taxonomy)
+        cube.save(cube_file)
+        return cube
+
+    def save(self, file_name: str) -> None:
+        with open(file_name, "wb") as file:
+            pickle.dump({"version": CUBE_VERSION,
+                         "signature": self.signature,
+                         "rules": self.taxonomy.rules,
+                         "cells": self.cells}, file, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, file_name: str) -> 'Cube' or None:
+        """
+        Загружает куб из файла.
+
+        :returns: Куб или None, если файл создан другой версией куба.
+        """
+        with open(file_name, "rb") as file:
+            state = pickle.load(file)
+        if state.get("version") != CUBE_VERSION:
+            return None
+        return cls(Taxonomy(state["rules"]), state["cells"], state["signature"])
+
+    # endregion
+    # region Queries
+    def get_cells_mask(self, region: str = None, year_from: int = None, year_to: int = None) -> np.ndarray:
+        mask = np.ones(len(self.cells), dtype=bool)
+        if region is not None:
+            mask &= (self.cells["area_name"] == region).to_numpy(dtype=bool)
+        if year_from is not None:
+            mask &= self.cells["published_at"].to_numpy() >= year_from
+        if year_to is not None:
+            mask &= self.cells["published_at"].to_numpy() <= year_to
+        return mask
+
+    def get_partial_statistics(self, profession_name: str, region: str = None, year_from: int = None,
+                               year_to: int = None) -> dict:
+        """
+        Собирает из ячеек суммы и количества в формате Aggregation.get_partial_statistics.
+
+        :param profession_name: Запрос из меток Taxonomy через '|'.
+        :param region: Регион для статистики по годам. Статистика по городам - по всей стране, как в get_batch_data.
+        :param year_from: Первый год включительно.
+        :param year_to: Последний год включительно.
+        """
+        if not self.taxonomy.is_label_query(profession_name):
+            raise KeyError(f"Запрос не из меток куба: {profession_name}")
+        period = self.get_cells_mask(year_from=year_from, year_to=year_to)
+        region_cells = period & self.get_cells_mask(region)
+        profession = self.taxonomy.get_mask(self.cells, profession_name.split("|"))
+
+        def total(mask: np.ndarray, key: str) -> pd.DataFrame:
+            return self.cells.loc[mask].groupby(key, observed=True)[["salary", "count"]].sum()
+
+        return {
+            "years": total(region_cells, "published_at"),
+            "profession_years": total(region_cells & profession, "published_at"),
+            "cities": total(period, "area_name"),
+        }
+
+    def get_statistics(self, profession_name: str, region: str = None, year_from: int = None,
+                       year_to: int = None) -> dict:
+        """
+        Возвращает словарь для Report, совпадающий с Aggregation.get_statistics по исходным вакансиям.
+
+        :param profession_name: Запрос из меток Taxonomy через '|'.
+        :param region: Регион для статистики по годам. None - вся страна.
+        :param year_from: Первый год включительно.
+        :param year_to: Последний год включительно.
+        """
+        return finalize_statistics(self.get_partial_statistics(profession_name, region, year_from, year_to))
+
+    # endregion
+
+
+def main() -> None:
+    parser = ArgumentParser(description="Построение куба агрегатов по файлу вакансий.")
+    parser.add_argument("source", help="CSV-файл или Parquet-набор вакансий.")
+    parser.add_argument("--cube", default=None, help="Файл куба. По-умолчанию рядом с исходным файлом.")
+    args = parser.parse_args()
+
+    cube = Cube.from_file(args.source, Taxonomy())
+    cube.save(args.cube or Cube.get_cube_file(args.source))
+    print(f"Ячеек: {len(cube)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+
+DEFAULT_KEY: tuple = ("name", "salary", "area_name", "published_at")
+
+
+class Deduplicator:
+    """
+    Потоковое удаление повторяющихся вакансий из частей датасета, как 2.3/Deduplication.py для строк CSV-файла.
+    Вакансия сворачивается в 64-битный хэш значений столбцов ключа, память - 8 байт на уникальную вакансию.
+
+    Attributes
+    ----------
+    key : tuple
+        Названия столбцов, по которым вакансии считаются одинаковыми.
+    dropped : int
+        Количество отброшенных строк-дубликатов.
+    hashes : np.ndarray
+        Отсортированные хэши уже встреченных вакансий.
+    """
+
+    key: tuple
+    dropped: int
+    hashes: np.ndarray
+
+    def __init__(self, key=DEFAULT_KEY):
+        self.key = tuple(key)
+        self.dropped = 0
+        self.hashes = np.empty(0, dtype=np.uint64)
+
+    def __len__(self) -> int:
+        return len(self.hashes)
+
+    def filter(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Оставляет только первые вхождения вакансий с учётом уже обработанных частей. Метки индекса сохраняются.
+
+        :param df: Часть датасета с исходной строкой даты в published_at: по году разные вакансии совпали бы.
+
+        >>> d = Deduplicator(key=('name',))
+        >>> d.filter(pd.DataFrame({'name': ['a', 'b', 'a']}))['name'].tolist()
+        ['a', 'b']
+        >>> d.filter(pd.DataFrame({'name': ['b', 'c']}))['name'].tolist(), d.dropped
+        (['c'], 2)
+        """
+        missing = [column for column in self.key if column not in df.columns]
+        if missing:
+            raise ValueError(f"В датасете нет столбцов ключа: {', '.join(missing)}")
+        hashes = pd.util.hash_pandas_object(df[list(self.key)], index=False).to_numpy()
+        is_new = ~pd.Series(hashes).duplicated().to_numpy()
+        if len(self.hashes):
+            positions = np.minimum(np.searchsorted(self.hashes, hashes), len(self.hashes) - 1)
+            is_new &= self.hashes[positions] != hashes
+        self.hashes = np.union1d(self.hashes, hashes[is_new])
+        self.dropped += int(len(df) - is_new.sum())
+        return df.loc[is_new]
@@ -0,0 +1,156 @@
+from itertools import zip_longest
+from typing import Iterable
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.chart import BarChart, PieChart, Reference
+from openpyxl.styles import Font, Border, Side, NamedStyle
+from openpyxl.styles.numbers import FORMAT_PERCENTAGE_00
+from openpyxl.utils import get_column_letter
+
+THIN_SIDE = Side(border_style="thin", color="000000")
+THIN_BORDER = Border(top=THIN_SIDE, left=THIN_SIDE, right=THIN_SIDE, bottom=THIN_SIDE)
+
+
+class StreamingExcelWriter:
+    """
+    Запись Excel-файла в режиме write-only: строки сразу уходят в файл, память не зависит от их количества.
+    Оформление задаётся тремя общими именованными стилями вместо отдельных Border и Font на каждую ячейку.
+
+    Attributes
+    ----------
+    workbook : Workbook
+        Книга openpyxl в режиме write_only.
+    file_name : str
+        Путь до сохраняемого файла.
+    """
+
+    workbook: Workbook
+    file_name: str
+    header_style: NamedStyle
+    cell_style: NamedStyle
+    percent_style: NamedStyle
+
+    def __init__(self, file_name: str):
+        """
+        Создаёт пустую книгу и регистрирует стили.
+
+        :param file_name: Название Excel-файла с явно указанным расширением.
+        """
+        self.file_name = file_name
+        self.workbook = Workbook(write_only=True)
+        self.header_style = NamedStyle(name="header", font=Font(bold=True), border=THIN_BORDER)
+        self.cell_style = NamedStyle(name="cell", border=THIN_BORDER)
+        self.percent_style = NamedStyle(name="percent", border=THIN_BORDER, number_format=FORMAT_PERCENTAGE_00)
+        for style in (self.header_style, self.cell_style, self.percent_style):
+            self.workbook.add_named_style(style)
+
+    def __enter__(self) -> 'StreamingExcelWriter':
+        return self
+
+    def __exit__(self, exc_type, *args) -> None:
+        if exc_type is None:
+            self.save()
+
+    def _get_cell(self, ws, value, style: str) -> WriteOnlyCell or None:
+        if value is None or value == "":
+            return None
+        cell = WriteOnlyCell(ws, value=value)
+        cell.style = style
+        return cell
+
+    def write_rows(self, title: str, header: list, rows: Iterable, widths: list = None,
+                   percent_columns: Iterable[int] = ()):
+        """
+        Записывает лист построчно. Ширины столбцов в режиме write-only задаются до первой строки, поэтому для
+        генераторов их нужно передать явно, иначе они считаются по заголовку.
+
+        :param title: Название листа.
+        :param header: Заголовки столбцов. Пустая строка - пустой столбец-разделитель.
+        :param rows: Строки значений, могут быть генератором.
+        :param widths: Ширины столбцов. По-умолчанию - длина заголовка + 1.
+        :param percent_columns: Номера столбцов (с 0) с процентным форматом.
+        :returns: Лист, на него ещё можно добавить диаграммы.
+        """
+        ws = self.workbook.create_sheet(title)
+        for index, width in enumerate(widths or [len(str(value)) + 1 for value in header], 1):
+            if width > 1:
+                ws.column_dimensions[get_column_letter(index)].width = width
+
+        percent_columns = set(percent_columns)
+        ws.append([self._get_cell(ws, value, "header") for value in header])
+        for row in rows:
+            ws.append([self._get_cell(ws, value, "percent" if index in percent_columns else "cell")
+                       for index, value in enumerate(row)])
+        return ws
+
+    def write_columns(self, title: str, columns: list, percent_columns: Iterable[int] = ()):
+        """
+        Записывает лист из столбцов разной длины. Ширины считаются в том же проходе, в котором столбцы собираются в
+        строки, повторного обхода ячеек листа нет.
+
+        :param title: Название листа.
+        :param columns: Список пар (заголовок, значения). None - пустой столбец-разделитель.
+        :param percent_columns: Номера столбцов (с 0) с процентным форматом.
+        :returns: Лист, на него ещё можно добавить диаграммы.
+        """
+        header, values, widths = [], [], []
+        for column in columns:
+            if column is None:
+                header.append("")
+                values.append([])
+                widths.append(0)
+                continue
+            name, column_values = column[0], list(column[1])
+            header.append(name)
+            values.append(column_values)
+            widths.append(max([len(str(value)) for value in column_values] + [len(str(name))]) + 1)
+        return self.write_rows(title, header, zip_longest(*values), widths, percent_columns)
+
+    def save(self) -> None:
+        self.workbook.save(self.file_name)
+
+
+def get_bar_chart(title: str) -> BarChart:
+    chart = BarChart()
+    chart.title = title
+    # openpyxl 3.1 скрывает оси, если не указать delete явно
+    chart.x_axis.delete = False
+    chart.y_axis.delete = False
+    return chart
+
+
+def add_report_charts(years_ws, cities_ws, years_count: int, cities_count: int, ratios_count: int) -> None:
+    """
+    Добавляет на листы отчёта диаграммы Excel, привязанные к уже записанным ячейкам: зарплаты и количество вакансий
+    по годам (столбцы A-E листа по годам), зарплаты по городам (A-B) и доли вакансий (D-E листа по городам).
+    Работает и с обычными листами, и с листами write-only.
+
+    :param years_ws: Лист статистики по годам.
+    :param cities_ws: Лист статистики по городам.
+    :param years_count: Количество строк с годами.
+    :param cities_count: Количество строк с уровнем зарплат по городам.
+    :param ratios_count: Количество строк с долями вакансий по городам вместе со строкой 'Другие': круговая диаграмма
+        строится по всем строкам, иначе доли городов растягиваются до 100%.
+    """
+    years = Reference(years_ws, min_col=1, min_row=2, max_row=years_count + 1)
+    for anchor, title, min_col in (("G2", "Уровень зарплат по годам", 2), ("G20", "Количество вакансий по годам", 4)):
+        chart = get_bar_chart(title)
+        chart.add_data(Reference(years_ws, min_col=min_col, max_col=min_col + 1, min_row=1, max_row=years_count + 1),
+                       titles_from_data=True)
+        chart.set_categories(years)
+        years_ws.add_chart(chart, anchor)
+
+    chart = get_bar_chart("Уровень зарплат по городам")
+    chart.type = "bar"
+    chart.legend = None
+    chart.x_axis.scaling.orientation = "maxMin"
+    chart.add_data(Reference(cities_ws, min_col=2, min_row=1, max_row=cities_count + 1), titles_from_data=True)
+    chart.set_categories(Reference(cities_ws, min_col=1, min_row=2, max_row=cities_count + 1))
+    cities_ws.add_chart(chart, "G2")
+
+    chart = PieChart()
+    chart.title = "Доля вакансий по городам"
+    chart.add_data(Reference(cities_ws, min_col=5, min_row=1, max_row=ratios_count + 1), titles_from_data=True)
+    chart.set_categories(Reference(cities_ws, min_col=4, min_row=2, max_row=ratios_count + 1))
+    cities_ws.add_chart(chart, "G20")
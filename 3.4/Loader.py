@@ -0,0 +1,170 @@
+import os
+from functools import reduce
+from operator import and_
+
+import pandas as pd
+
+from Deduplication import Deduplicator
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    NAME_DTYPE = "string[pyarrow]"
+except ImportError:
+    pa = ds = None
+    NAME_DTYPE = "string"
+
+COLUMNS = ["name", "salary", "area_name", "published_at"]
+CHUNK_SIZE = 200_000
+CHUNKED_FILE_SIZE = 2 ** 30
+PARQUET_SUFFIX = ".parquet"
+
+
+def get_dtypes(salary_dtype: str = "Int64") -> dict:
+    """
+    Возвращает типы столбцов CSV-файла вакансий: название - строки Arrow (без pyarrow - строки pandas), регион -
+    категория, дата публикации читается строкой для векторного разбора.
+    """
+    return {"name": NAME_DTYPE, "salary": salary_dtype, "area_name": "category", "published_at": "string"}
+
+
+def add_year(df: pd.DataFrame, month: bool = False) -> pd.DataFrame:
+    """
+    Заменяет дату публикации годом (и добавляет месяц) срезом строки, без разбора каждой даты.
+    Год берётся из записи даты, как и при datetime.fromisoformat(s).year.
+
+    :param df: Датасет со строковым столбцом published_at в формате 2022-07-05T18:19:30+0300.
+    :param month: Добавить столбец month.
+
+    >>> add_year(pd.DataFrame({'published_at': ['2022-07-05T18:19:30+0300']}), month=True)
+       published_at  month
+    0          2022      7
+    """
+    published_at = df["published_at"].astype("string")
+    columns = {"published_at": published_at.str[:4].astype("int32")}
+    if month:
+        columns["month"] = published_at.str[5:7].astype("int8")
+    return df.assign(**columns)
+
+
+def deduplicate(df: pd.DataFrame, deduplicator: Deduplicator, columns: list) -> pd.DataFrame:
+    """
+    Удаляет повторяющиеся вакансии и столбцы ключа, прочитанные только для удаления дубликатов.
+    """
+    df = deduplicator.filter(df)
+    return df.drop(columns=[column for column in df.columns if column not in columns])
+
+
+def get_read_columns(columns: list, deduplicator: Deduplicator or None) -> list:
+    return columns if deduplicator is None else list(dict.fromkeys([*columns, *deduplicator.key]))
+
+
+def load_vacancies(file_name: str, columns: list = None, year: bool = True, month: bool = False,
+                   salary_dtype: str = "Int64", deduplicator: Deduplicator = None) -> pd.DataFrame:
+    """
+    Читает из CSV-файла вакансий только нужные столбцы сразу в компактных типах.
+
+    :param file_name: Путь до CSV-файла.
+    :param columns: Нужные столбцы. По-умолчанию name, salary, area_name, published_at.
+    :param year: Заменить published_at годом. False - оставить строку даты, например для TimeIndex.
+    :param month: Добавить столбец month (только вместе с year).
+    :param salary_dtype: Тип столбца зарплаты.
+    :param deduplicator: Если передан, повторяющиеся вакансии отбрасываются до замены даты годом, количество
+        отброшенных строк - в deduplicator.dropped.
+    """
+    if file_name.endswith(PARQUET_SUFFIX) and deduplicator is None:
+        return load_parquet(file_name, columns, year, month, salary_dtype)
+    columns = columns or COLUMNS
+    read_columns = get_read_columns(columns, deduplicator)
+    if file_name.endswith(PARQUET_SUFFIX):
+        df = load_parquet(file_name, read_columns, year=False, salary_dtype=salary_dtype)
+    else:
+        dtypes = {column: dtype for column, dtype in get_dtypes(salary_dtype).items() if column in read_columns}
+        df = pd.read_csv(file_name, usecols=read_columns, dtype=dtypes)
+    if deduplicator is not None:
+        df = deduplicate(df, deduplicator, columns)
+    if year and "published_at" in columns:
+        df = add_year(df, month)
+    return df
+
+
+def is_large_file(file_name: str) -> bool:
+    """
+    Проверяет, что CSV-файл лучше обрабатывать частями через iter_vacancies, а не загружать целиком.
+    """
+    return os.path.getsize(file_name) > CHUNKED_FILE_SIZE
+
+
+def iter_vacancies(file_name: str, chunk_size: int = CHUNK_SIZE, columns: list = None, year: bool = True,
+                   month: bool = False, salary_dtype: str = "Int64", deduplicator: Deduplicator = None):
+    """
+    Читает CSV-файл вакансий частями не больше chunk_size строк в тех же типах, что и load_vacancies. В памяти
+    находится только одна часть, метки индекса - номера строк в файле.
+
+    :param file_name: Путь до CSV-файла.
+    :param chunk_size: Количество строк в части.
+    :param columns: Нужные столбцы. По-умолчанию name, salary, area_name, published_at.
+    :param year: Заменить published_at годом.
+    :param month: Добавить столбец month (только вместе с year).
+    :param salary_dtype: Тип столбца зарплаты.
+    :param deduplicator: Общий для всех частей Deduplicator: вакансия, уже встреченная в одной из прошлых частей,
+        отбрасывается. Количество отброшенных строк - в deduplicator.dropped.
+    :returns: Генератор DataFrame.
+    """
+    columns = columns or COLUMNS
+    read_columns = get_read_columns(columns, deduplicator)
+    dtypes = {column: dtype for column, dtype in get_dtypes(salary_dtype).items() if column in read_columns}
+    with pd.read_csv(file_name, usecols=read_columns, dtype=dtypes, chunksize=chunk_size) as reader:
+        for chunk in reader:
+            if deduplicator is not None:
+                chunk = deduplicate(chunk, deduplicator, columns)
+            yield add_year(chunk, month) if year and "published_at" in columns else chunk
+
+
+def get_parquet_filter(area_name: str = None, year_from: int = None, year_to: int = None) -> 'ds.Expression' or None:
+    """
+    Собирает условие отбора строк для pyarrow.dataset. Условие по году отбрасывает целые партиции year=...,
+    условие по региону проверяется при чтении, без преобразования строк в pandas.
+    """
+    conditions = []
+    if area_name is not None:
+        conditions.append(ds.field("area_name") == area_name)
+    if year_from is not None:
+        conditions.append(ds.field("year") >= year_from)
+    if year_to is not None:
+        conditions.append(ds.field("year") <= year_to)
+    return reduce(and_, conditions) if conditions else None
+
+
+def load_parquet(directory: str, columns: list = None, year: bool = True, month: bool = False,
+                 salary_dtype: str = "Int64", area_name: str = None, year_from: int = None,
+                 year_to: int = None) -> pd.DataFrame:
+    """
+    Читает набор Parquet-файлов из Partitions.partition_parquet: только нужные столбцы и только строки, подходящие
+    под регион и диапазон лет. Типы столбцов - как у load_vacancies.
+
+    :param directory: Папка набора с партициями year=....
+    :param columns: Нужные столбцы. По-умолчанию name, salary, area_name, published_at.
+    :param year: Заменить published_at годом. Год берётся из ключа партиции, строки дат не читаются.
+    :param month: Добавить столбец month (только вместе с year).
+    :param salary_dtype: Тип столбца зарплаты.
+    :param area_name: Регион. None - все регионы.
+    :param year_from: Первый год включительно.
+    :param year_to: Последний год включительно.
+    """
+    if ds is None:
+        raise ImportError("Для чтения Parquet нужен pyarrow")
+    columns = columns or COLUMNS
+    from_partition = year and not month and "published_at" in columns
+    read_columns = ["year" if column == "published_at" and from_partition else column for column in columns]
+
+    dataset = ds.dataset(directory, format="parquet", partitioning="hive")
+    table = dataset.to_table(columns=read_columns, filter=get_parquet_filter(area_name, year_from, year_to))
+    df = table.to_pandas(types_mapper={pa.int64(): pd.Int64Dtype()}.get).rename(columns={"year": "published_at"})
+    dtypes = {column: dtype for column, dtype in get_dtypes(salary_dtype).items() if column in columns}
+    if from_partition:
+        dtypes["published_at"] = "int32"
+    df = df.astype(dtypes)
+    if year and not from_partition and "published_at" in columns:
+        df = add_year(df, month)
+    return df
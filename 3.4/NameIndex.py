@@ -0,0 +1,216 @@
+import os
+import pickle
+import re
+from bisect import bisect_left
+
+import numpy as np
+import pandas as pd
+
+from NameMasks import NameMasks, REGEX_METACHARACTERS
+
+TOKEN_PATTERN = re.compile(r"\w+")
+INDEX_VERSION = 1
+
+
+def normalize_name(name: str) -> str:
+    """
+    Приводит название вакансии к виду, в котором ведётся поиск. Совпадает с преобразованием в
+    Aggregation.get_profession_mask.
+
+    :param name: Название вакансии.
+    :returns: Название в нижнем регистре.
+
+    >>> normalize_name('Senior Python-Программист')
+    'senior python-программист'
+    """
+    return name.lower() if isinstance(name, str) else ""
+
+
+class NameIndex:
+    """
+    Инвертированный индекс по токенам названий вакансий. Запрос по профессии сводится к поиску подходящих токенов в
+    словаре и пересечению их списков строк, результат совпадает с поиском подстроки в названии. Части запроса
+    ищутся как обычные подстроки; запрос с символами регулярных выражений (кроме '|') выполняется через NameMasks
+    по сохранённым названиям, как str.contains.
+
+    Attributes
+    ----------
+    tokens : list
+        Отсортированный словарь токенов названий.
+    postings : list
+        Для каждого токена - отсортированный массив номеров строк (позиций в DataFrame), где он встречается.
+    names : list
+        Нормализованные названия вакансий, нужны для проверки запросов из нескольких слов.
+    signature : tuple
+        Размер и время изменения CSV-файла, по которому построен индекс.
+    """
+
+    tokens: list
+    postings: list
+    names: list
+    signature: tuple
+
+    def __init__(self, names, signature: tuple = None):
+        """
+        Строит индекс по списку названий.
+
+        :param names: Названия вакансий в порядке строк датасета.
+        :param signature: Подпись исходного файла для проверки актуальности сохранённого индекса.
+        """
+        self.names = [normalize_name(name) for name in names]
+        self.signature = signature
+        self._fragments_cache = {}
+        self._masks = None
+
+        token_rows = {}
+        for row, name in enumerate(self.names):
+            for token in set(TOKEN_PATTERN.findall(name)):
+                token_rows.setdefault(token, []).append(row)
+
+        self.tokens = sorted(token_rows)
+        self.postings = [np.array(token_rows[token], dtype=np.uint32) for token in self.tokens]
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    # region Persistence
+    @staticmethod
+    def get_signature(file_name: str) -> tuple:
+        stat = os.stat(file_name)
+        return stat.st_size, stat.st_mtime_ns
+
+    @classmethod
+    def from_csv(cls, file_name: str) -> 'NameIndex':
+        """
+        Строит индекс по столбцу name CSV-файла.
+
+        :param file_name: Путь до CSV-файла.
+        """
+        names = pd.read_csv(file_name, usecols=["name"], dtype={"name": "str"})["name"]
+        return cls(names, cls.get_signature(file_name))
+
+    @classmethod
+    def for_file(cls, file_name: str, index_file: str = None) -> 'NameIndex':
+        """
+        Возвращает сохранённый индекс для CSV-файла, если он актуален, иначе строит и сохраняет новый.
+
+        :param file_name: Путь до CSV-файла.
+        :param index_file: Путь до файла индекса. По-умолчанию рядом с CSV-файлом с расширением .nameidx.
+        """
+        index_file = index_file or f"{os.path.splitext(file_name)[0]}.nameidx"
+        if os.path.exists(index_file):
+            index = cls.load(index_file)
+            if index is not None and index.signature == cls.get_signature(file_name):
+                return index
+
+        index = cls.from_csv(file_name)
+        index.save(index_file)
+        return index
+
+    def save(self, file_name: str) -> None:
+        with open(file_name, "wb") as file:
+            pickle.dump({"version": INDEX_VERSION,
+                         "signature": self.signature,
+                         "tokens": self.tokens,
+                         "postings": self.postings,
+                         "names": self.names}, file, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, file_name: str) -> 'NameIndex' or None:
+        """
+        Загружает индекс из файла.
+
+        :returns: Индекс или None, если файл создан другой версией индекса.
+        """
+        with open(file_name, "rb") as file:
+            state = pickle.load(file)
+        if state.get("version") != INDEX_VERSION:
+            return None
+        index = cls.__new__(cls)
+        index.signature = state["signature"]
+        index.tokens = state["tokens"]
+        index.postings = state["postings"]
+        index.names = state["names"]
+        index._fragments_cache = {}
+        index._masks = None
+        return index
+
+    # endregion
+    # region Search
+    def get_tokens_with_prefix(self, prefix: str) -> range:
+        """
+        Возвращает номера токенов словаря, начинающихся с prefix.
+
+        >>> NameIndex(['Java', 'JavaScript', 'Go']).get_tokens_with_prefix('java')
+        range(1, 3)
+        """
+        start = bisect_left(self.tokens, prefix)
+        end = bisect_left(self.tokens, prefix + "\U0010ffff", start)
+        return range(start, end)
+
+    def get_fragment_rows(self, fragment: str) -> np.ndarray:
+        """
+        Возвращает строки, в названии которых есть токен, содержащий fragment как подстроку. Префиксы находятся
+        бинарным поиском, остальной словарь просматривается один раз на фрагмент, результат кэшируется.
+
+        :param fragment: Часть запроса без разделителей.
+        """
+        if fragment not in self._fragments_cache:
+            prefixed = self.get_tokens_with_prefix(fragment)
+            token_ids = list(prefixed)
+            token_ids += [i for i, token in enumerate(self.tokens)
+                          if i not in prefixed and fragment in token]
+            if not token_ids:
+                rows = np.empty(0, dtype=np.uint32)
+            elif len(token_ids) == 1:
+                rows = self.postings[token_ids[0]]
+            else:
+                rows = np.unique(np.concatenate([self.postings[i] for i in token_ids]))
+            self._fragments_cache[fragment] = rows
+        return self._fragments_cache[fragment]
+
+    def search_substring(self, substring: str) -> np.ndarray:
+        """
+        Возвращает строки, в названии которых содержится substring.
+
+        :param substring: Искомая подстрока в любом регистре.
+        """
+        substring = normalize_name(substring)
+        fragments = TOKEN_PATTERN.findall(substring)
+        if not fragments:
+            return np.array([i for i, name in enumerate(self.names) if substring in name], dtype=np.uint32)
+
+        rows = self.get_fragment_rows(fragments[0])
+        for fragment in fragments[1:]:
+            rows = np.intersect1d(rows, self.get_fragment_rows(fragment), assume_unique=True)
+
+        if fragments == [substring]:
+            return rows
+        return np.array([i for i in rows if substring in self.names[i]], dtype=np.uint32)
+
+    def search(self, profession_name: str) -> np.ndarray:
+        """
+        Возвращает отсортированные номера строк, в названии которых есть хотя бы одна из подстрок, перечисленных
+        через '|'. Номера строк файла совпадают с метками строк DataFrame из Loader.load_vacancies и
+        Loader.iter_vacancies, в том числе после отбора периода.
+
+        :param profession_name: Название профессии, можно несколько через разделитель '|'.
+
+        >>> index = NameIndex(['Программист Python', 'Аналитик', 'Digital-маркетолог', 'IT-рекрутер'])
+        >>> index.search('программист|IT').tolist()
+        [0, 2, 3]
+        >>> index.search('python').tolist()
+        [0]
+        >>> index.search('^it').tolist()
+        [3]
+        """
+        if not (REGEX_METACHARACTERS - {"|"}).isdisjoint(profession_name):
+            if self._masks is None:
+                self._masks = NameMasks(pd.Series([name or None for name in self.names], dtype="string"))
+            return self._masks.search(profession_name)
+        alternatives = [self.search_substring(part) for part in profession_name.split("|")]
+        if len(alternatives) == 1:
+            return alternatives[0]
+        return np.unique(np.concatenate(alternatives))
+
+    # endregion
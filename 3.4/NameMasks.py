@@ -0,0 +1,110 @@
+import weakref
+
+import numpy as np
+import pandas as pd
+
+REGEX_METACHARACTERS = frozenset(".^$*+?{}[]\\|()")
+
+_masks_by_frame = {}
+
+
+def split_query(profession_name: str) -> list:
+    """
+    Разбивает запрос на альтернативы через '|', как NameIndex.search. Запрос со скобками считается одним регулярным
+    выражением: '|' внутри групп разбивать нельзя.
+
+    :param profession_name: Запрос в нижнем регистре.
+    :returns: Список термов.
+
+    >>> split_query('программист|r&d')
+    ['программист', 'r&d']
+    >>> split_query('(java|kotlin) developer')
+    ['(java|kotlin) developer']
+    """
+    if any(character in profession_name for character in "()[]"):
+        return [profession_name]
+    return profession_name.split("|")
+
+
+class NameMasks:
+    """
+    Маски поиска профессии по названиям одного датасета. Названия приводятся к нижнему регистру один раз, маска
+    каждого терма запроса считается один раз и кэшируется, запросы из нескольких термов через '|' собираются из
+    кэшированных масок векторным ИЛИ. Терм без символов регулярных выражений ищется как обычная подстрока.
+    Совместим с NameIndex по методу search и результату.
+
+    Attributes
+    ----------
+    names : pd.Series
+        Названия вакансий в нижнем регистре.
+    masks : dict
+        Кэш масок: {терм: np.ndarray из bool}.
+    """
+
+    names: pd.Series
+    masks: dict
+
+    def __init__(self, names):
+        names = pd.Series(names)
+        if names.dtype == object:
+            names = names.astype("string")
+        self.names = names.str.lower()
+        self.masks = {}
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @classmethod
+    def for_frame(cls, df: pd.DataFrame, column: str = "name") -> 'NameMasks':
+        """
+        Возвращает общие маски для DataFrame, пока он существует: повторные запросы по тому же датасету не приводят
+        названия к нижнему регистру заново.
+
+        :param df: Датасет со столбцом названий.
+        :param column: Столбец названий.
+
+        >>> df = pd.DataFrame({'name': ['Программист']})
+        >>> NameMasks.for_frame(df) is NameMasks.for_frame(df)
+        True
+        """
+        key = (id(df), column)
+        if key in _masks_by_frame:
+            frame, masks = _masks_by_frame[key]
+            if frame() is df:
+                return masks
+
+        masks = cls(df[column])
+        _masks_by_frame[key] = (weakref.ref(df), masks)
+        weakref.finalize(df, _masks_by_frame.pop, key, None)
+        return masks
+
+    def get_term_mask(self, term: str) -> np.ndarray:
+        """
+        Возвращает маску названий, содержащих терм.
+
+        :param term: Подстрока или регулярное выражение в нижнем регистре.
+        """
+        if term not in self.masks:
+            regex = not REGEX_METACHARACTERS.isdisjoint(term)
+            self.masks[term] = self.names.str.contains(term, regex=regex).fillna(False).to_numpy(dtype=bool)
+        return self.masks[term]
+
+    def get_mask(self, profession_name: str) -> np.ndarray:
+        """
+        Возвращает маску названий, подходящих под запрос, как str.contains(profession_name) в нижнем регистре.
+
+        :param profession_name: Название профессии, можно несколько через разделитель '|'.
+
+        >>> masks = NameMasks(['Senior Python-программист', 'Python-аналитик', 'Водитель', None])
+        >>> masks.get_mask('Программист|водитель').tolist()
+        [True, False, True, False]
+        """
+        return np.logical_or.reduce([self.get_term_mask(term) for term in split_query(profession_name.lower())])
+
+    def search(self, profession_name: str) -> np.ndarray:
+        """
+        Возвращает метки строк, подходящих под запрос: для Series - её индекс, для списка - номера строк.
+
+        :param profession_name: Название профессии, можно несколько через разделитель '|'.
+        """
+        return self.names.index.to_numpy()[self.get_mask(profession_name)]
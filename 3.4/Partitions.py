@@ -0,0 +1,223 @@
+import os
+import re
+import shutil
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor
+from csv import reader as csv_reader, writer as csv_writer
+from itertools import repeat
+
+import pandas as pd
+
+from Aggregation import get_partial_statistics, merge_partial_statistics, finalize_statistics
+from Loader import CHUNK_SIZE, add_year, iter_vacancies, load_vacancies
+from TimeIndex import slice_period, to_timestamp
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+PARTITION_KEY = re.compile(r"\d{4}(-\d{2})?")
+
+
+def get_partition_key(published_at: str, by: str = "year") -> str:
+    """
+    Возвращает ключ партиции для даты публикации.
+
+    :param published_at: Дата в формате 2022-07-05T18:19:30+0300.
+    :param by: 'year' или 'month'.
+
+    >>> get_partition_key('2022-07-05T18:19:30+0300'), get_partition_key('2022-07-05T18:19:30+0300', 'month')
+    ('2022', '2022-07')
+    """
+    return published_at[:4] if by == "year" else published_at[:7]
+
+
+def prepare_directory(directory: str, overwrite: bool = False) -> None:
+    """
+    Создаёт пустую папку для набора партиций. Партиции прошлого разбиения не остаются рядом с новыми, иначе лишние
+    годы читались бы вместе с новым набором.
+
+    :param directory: Папка для партиций.
+    :param overwrite: Удалить содержимое непустой папки. False - не писать в непустую папку.
+    """
+    if os.path.isdir(directory) and os.listdir(directory):
+        if not overwrite:
+            raise FileExistsError(f"Папка {directory} не пуста, для перезаписи передайте overwrite=True")
+        shutil.rmtree(directory)
+    os.makedirs(directory, exist_ok=True)
+
+
+def partition_csv(source: str, directory: str, by: str = "year", overwrite: bool = False) -> dict:
+    """
+    Переписывает CSV-файл в набор файлов по годам или месяцам: directory/2022.csv или directory/2022-07.csv.
+    Файл читается один раз потоково, порядок строк внутри партиции сохраняется.
+
+    :param source: Путь до исходного CSV-файла.
+    :param directory: Папка для партиций, создаётся при необходимости.
+    :param by: 'year' или 'month'.
+    :param overwrite: Удалить партиции, уже лежащие в папке. False - не писать в непустую папку.
+    :returns: {ключ партиции: количество строк}.
+    """
+    if by not in ("year", "month"):
+        raise ValueError(f"Неизвестный способ разбиения: {by}")
+    prepare_directory(directory, overwrite)
+
+    files, writers, counts = {}, {}, {}
+    try:
+        with open(source, "r", newline="", encoding="utf-8-sig") as src:
+            rows = csv_reader(src)
+            header = next(rows)
+            column = header.index("published_at")
+            for row in rows:
+                key = get_partition_key(row[column], by)
+                if key not in writers:
+                    files[key] = open(os.path.join(directory, f"{key}.csv"), "w", newline="", encoding="utf-8")
+                    writers[key] = csv_writer(files[key])
+                    writers[key].writerow(header)
+                    counts[key] = 0
+                writers[key].writerow(row)
+                counts[key] += 1
+    finally:
+        for file in files.values():
+            file.close()
+    return dict(sorted(counts.items()))
+
+
+def get_parquet_schema() -> 'pa.Schema':
+    """
+    Схема Parquet-набора: регион хранится словарём, дата публикации - строкой для TimeIndex.
+    """
+    return pa.schema([("name", pa.string()), ("salary", pa.int64()),
+                      ("area_name", pa.dictionary(pa.int32(), pa.string())), ("published_at", pa.string())])
+
+
+def partition_parquet(source: str, directory: str, chunk_size: int = CHUNK_SIZE, overwrite: bool = False) -> dict:
+    """
+    Переписывает CSV-файл в набор Parquet-файлов по годам: directory/year=2022/part-0.parquet. Файл читается
+    частями, каждая часть дописывается в файлы своих лет группами строк. Читать набор - Loader.load_parquet.
+
+    :param source: Путь до исходного CSV-файла.
+    :param directory: Папка набора, по соглашению с расширением .parquet.
+    :param chunk_size: Количество строк CSV-файла в одной части.
+    :param overwrite: Удалить партиции, уже лежащие в папке. False - не писать в непустую папку.
+    :returns: {год: количество строк}.
+    """
+    if pq is None:
+        raise ImportError("Для записи Parquet нужен pyarrow")
+    prepare_directory(directory, overwrite)
+    schema = get_parquet_schema()
+    writers, counts = {}, {}
+    try:
+        for chunk in iter_vacancies(source, chunk_size, year=False):
+            for key, part in chunk.groupby(chunk["published_at"].str[:4], sort=True):
+                if key not in writers:
+                    os.makedirs(os.path.join(directory, f"year={key}"), exist_ok=True)
+                    writers[key] = pq.ParquetWriter(os.path.join(directory, f"year={key}", "part-0.parquet"), schema)
+                    counts[key] = 0
+                writers[key].write_table(pa.Table.from_pandas(part, schema=schema, preserve_index=False))
+                counts[key] += len(part)
+    finally:
+        for writer in writers.values():
+            writer.close()
+    return dict(sorted(counts.items()))
+
+
+def get_partition_period(file_name: str) -> (int, int):
+    """
+    Возвращает период партиции по имени файла в секундах местного времени, как TimeIndex.to_timestamp:
+    полуинтервал [начало, конец).
+
+    :param file_name: Путь до партиции 2022.csv или 2022-07.csv.
+
+    >>> get_partition_period('2022-12.csv') == (to_timestamp('2022-12-01'), to_timestamp('2023-01-01'))
+    True
+    >>> get_partition_period('2022.csv') == (to_timestamp('2022-01-01'), to_timestamp('2023-01-01'))
+    True
+    """
+    key = os.path.splitext(os.path.basename(file_name))[0]
+    start = pd.Timestamp(int(key[:4]), int(key[5:7] or 1), 1)
+    end = start + pd.DateOffset(months=1 if len(key) > 4 else 12)
+    return to_timestamp(start), to_timestamp(end)
+
+
+def get_partition_files(directory: str, date_from=None, date_to=None) -> list:
+    """
+    Возвращает отсортированные пути до партиций, пересекающихся с периодом: по годам для 2022.csv, по месяцам для
+    2022-07.csv. Остальные партиции и посторонние CSV-файлы в папке не читаются.
+
+    :param directory: Папка с партициями.
+    :param date_from: Начало периода включительно. None - без ограничения.
+    :param date_to: Конец периода не включительно. None - без ограничения.
+    """
+    files = []
+    for file_name in sorted(os.listdir(directory)):
+        key, extension = os.path.splitext(file_name)
+        if extension != ".csv" or PARTITION_KEY.fullmatch(key) is None:
+            continue
+        start, end = get_partition_period(file_name)
+        if (date_from is None or end > to_timestamp(date_from)) and (date_to is None or start < to_timestamp(date_to)):
+            files.append(os.path.join(directory, file_name))
+    return files
+
+
+def read_partition(file_name: str, date_from=None, date_to=None) -> pd.DataFrame:
+    """
+    Читает партицию и отбирает вакансии за период через TimeIndex. Для партиции, целиком попадающей в период,
+    индекс не строится.
+    """
+    start, end = get_partition_period(file_name)
+    if (date_from is None or start >= to_timestamp(date_from)) and (date_to is None or end <= to_timestamp(date_to)):
+        return load_vacancies(file_name)
+    return add_year(slice_period(load_vacancies(file_name, year=False), date_from, date_to))
+
+
+def aggregate_partition(file_name: str, profession_name: str, date_from=None, date_to=None,
+                        region: str = None) -> dict:
+    return get_partial_statistics(read_partition(file_name, date_from, date_to), profession_name, region=region)
+
+
+def aggregate_partitions(directory: str, profession_name: str, date_from=None, date_to=None, region: str = None,
+                         processes: int = None) -> dict:
+    """
+    Считает статистику по партициям, пересекающимся с периодом, параллельно и объединяет результат. Вакансии
+    на границах периода отбираются точно, поэтому результат совпадает с полным чтением исходного файла.
+
+    :param directory: Папка с партициями.
+    :param profession_name: Название профессии, можно несколько через разделитель '|'.
+    :param date_from: Начало периода включительно.
+    :param date_to: Конец периода не включительно.
+    :param region: Регион для статистики по годам. None - вся страна.
+    :param processes: Количество процессов. По-умолчанию - по числу ядер.
+    :returns: Словарь для Report, как у Aggregation.get_statistics.
+    """
+    files = get_partition_files(directory, date_from, date_to)
+    if not files:
+        raise FileNotFoundError(f"В {directory} нет партиций за период {date_from} - {date_to}")
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        partials = list(executor.map(aggregate_partition, files, repeat(profession_name), repeat(date_from),
+                                     repeat(date_to), repeat(region)))
+    return finalize_statistics(merge_partial_statistics(partials))
+
+
+def main() -> None:
+    parser = ArgumentParser(description="Разбиение CSV-файла вакансий на партиции по годам или месяцам.")
+    parser.add_argument("source", help="Исходный CSV-файл.")
+    parser.add_argument("directory", help="Папка для партиций.")
+    parser.add_argument("--by", default="year", choices=["year", "month"])
+    parser.add_argument("--format", default="csv", choices=["csv", "parquet"],
+                        help="parquet - набор Parquet-файлов по годам для Loader.load_parquet.")
+    parser.add_argument("--overwrite", action="store_true", help="Удалить партиции, уже лежащие в папке.")
+    args = parser.parse_args()
+
+    if args.format == "parquet":
+        counts = partition_parquet(args.source, args.directory, overwrite=args.overwrite)
+    else:
+        counts = partition_csv(args.source, args.directory, args.by, args.overwrite)
+    for key, count in counts.items():
+        print(f"{key}: {count}")
+
+
+if __name__ == "__main__":
+    main()
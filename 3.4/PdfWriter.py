@@ -0,0 +1,66 @@
+import os
+
+import matplotlib
+from fpdf import FPDF
+
+FONT_DIRECTORY = os.path.join(matplotlib.get_data_path(), "fonts", "ttf")
+
+
+class PdfWriter:
+    """
+    Сборка PDF-отчёта в текущем процессе через fpdf2, без запуска wkhtmltopdf. Кириллица выводится шрифтом DejaVu Sans,
+    который поставляется вместе с matplotlib.
+
+    Attributes
+    ----------
+    pdf : FPDF
+        Документ fpdf2.
+    """
+
+    pdf: FPDF
+
+    def __init__(self, title: str):
+        """
+        Создаёт документ и первую страницу с заголовком.
+
+        :param title: Заголовок отчёта.
+        """
+        self.pdf = FPDF(orientation="P", unit="mm", format="A4")
+        self.pdf.add_font("DejaVu", "", os.path.join(FONT_DIRECTORY, "DejaVuSans.ttf"))
+        self.pdf.add_font("DejaVu", "B", os.path.join(FONT_DIRECTORY, "DejaVuSans-Bold.ttf"))
+        self.pdf.set_auto_page_break(True, margin=10)
+        self.pdf.add_page()
+        self.pdf.set_font("DejaVu", "B", 16)
+        self.pdf.multi_cell(0, 8, title, align="C", new_x="LMARGIN", new_y="NEXT")
+        self.pdf.ln(4)
+
+    def add_image(self, image) -> None:
+        """
+        Вставляет изображение на всю ширину страницы.
+
+        :param image: Путь до изображения или файловый объект с ним.
+        """
+        self.pdf.image(image, w=self.pdf.epw)
+        self.pdf.ln(4)
+
+    def add_table(self, title: str, header: list, rows: list, col_widths: tuple) -> None:
+        """
+        Выводит таблицу с заголовком. Длинные заголовки столбцов переносятся по словам.
+
+        :param title: Подзаголовок над таблицей.
+        :param header: Заголовки столбцов.
+        :param rows: Строки таблицы.
+        :param col_widths: Относительные ширины столбцов.
+        """
+        self.pdf.set_font("DejaVu", "B", 13)
+        self.pdf.cell(0, 10, title, align="C", new_x="LMARGIN", new_y="NEXT")
+        self.pdf.set_font("DejaVu", "", 9)
+        with self.pdf.table(col_widths=col_widths, text_align="CENTER", line_height=5) as table:
+            for row in [header] + rows:
+                table_row = table.row()
+                for value in row:
+                    table_row.cell(str(value))
+        self.pdf.ln(4)
+
+    def save(self, file_name: str) -> None:
+        self.pdf.output(file_name)
@@ -0,0 +1,163 @@
+import pickle
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+
+def get_codes_dtype(categories_count: int) -> np.dtype:
+    """
+    Возвращает тип кодов, который pandas сам выбирает для Categorical, чтобы from_codes не копировал массив.
+
+    >>> get_codes_dtype(10), get_codes_dtype(1000)
+    (dtype('int8'), dtype('int16'))
+    """
+    for dtype in (np.int8, np.int16, np.int32):
+        if categories_count < np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    return np.dtype(np.int64)
+
+
+class SharedColumns:
+    """
+    Столбцы датасета в блоках multiprocessing.shared_memory. Числовые столбцы хранятся массивами (для Int64 - ещё и
+    маска пропусков), строковые - словарным кодированием: коды в общей памяти, словарь - в отдельном блоке.
+    Процесс-владелец публикует столбцы через publish, рабочие процессы подключаются через attach по spec и собирают
+    DataFrame без копирования данных.
+
+    Attributes
+    ----------
+    spec : dict
+        Описание блоков, передаётся в рабочие процессы: {столбец: {вид, имена блоков, dtype, длина}}.
+    blocks : list
+        Открытые блоки общей памяти этого процесса.
+    is_owner : bool
+        True для процесса, создавшего блоки. Только он освобождает их через unlink.
+    """
+
+    spec: dict
+    blocks: list
+    is_owner: bool
+
+    def __init__(self, spec: dict, blocks: list, is_owner: bool):
+        self.spec = spec
+        self.blocks = blocks
+        self.is_owner = is_owner
+
+    def __enter__(self) -> 'SharedColumns':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+        if self.is_owner:
+            self.unlink()
+
+    @staticmethod
+    def _create_block(array: np.ndarray, blocks: list) -> str:
+        block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[:] = array
+        blocks.append(block)
+        return block.name
+
+    @classmethod
+    def publish(cls, df: pd.DataFrame, columns: list = None) -> 'SharedColumns':
+        """
+        Копирует столбцы DataFrame в общую память один раз.
+
+        :param df: Датасет вакансий.
+        :param columns: Столбцы для публикации. По-умолчанию все.
+        :returns: Объект-владелец, его spec передаётся в рабочие процессы.
+        """
+        spec, blocks = {}, []
+        try:
+            for column in columns or list(df.columns):
+                series = df[column]
+                if isinstance(series.array, pd.arrays.IntegerArray):
+                    values = series.to_numpy(dtype=series.dtype.numpy_dtype, na_value=0)
+                    mask = series.isna().to_numpy()
+                    spec[column] = {"kind": "masked", "dtype": series.dtype.name, "length": len(series),
+                                    "values": cls._create_block(values, blocks),
+                                    "mask": cls._create_block(mask, blocks)}
+                elif pd.api.types.is_numeric_dtype(series.dtype) or pd.api.types.is_bool_dtype(series.dtype):
+                    values = series.to_numpy()
+                    spec[column] = {"kind": "numeric", "dtype": values.dtype.str, "length": len(series),
+                                    "values": cls._create_block(values, blocks)}
+                else:
+                    codes, categories = pd.factorize(series, use_na_sentinel=True)
+                    dictionary = np.frombuffer(pickle.dumps(list(categories), pickle.HIGHEST_PROTOCOL), np.uint8)
+                    spec[column] = {"kind": "category", "length": len(series),
+                                    "codes": cls._create_block(codes.astype(get_codes_dtype(len(categories))), blocks),
+                                    "codes_dtype": get_codes_dtype(len(categories)).str,
+                                    "dictionary": cls._create_block(dictionary, blocks),
+                                    "dictionary_size": dictionary.nbytes}
+        except BaseException:
+            for block in blocks:
+                block.close()
+                block.unlink()
+            raise
+        return cls(spec, blocks, True)
+
+    @classmethod
+    def attach(cls, spec: dict) -> 'SharedColumns':
+        """
+        Подключается к опубликованным блокам в рабочем процессе.
+
+        :param spec: Атрибут spec объекта-владельца.
+        """
+        blocks = []
+        for description in spec.values():
+            for key in ("values", "mask", "codes", "dictionary"):
+                if key in description:
+                    blocks.append(shared_memory.SharedMemory(name=description[key]))
+        return cls(spec, blocks, False)
+
+    def _get_array(self, name: str, dtype, length: int) -> np.ndarray:
+        block = next(block for block in self.blocks if block.name == name)
+        return np.ndarray((length,), dtype=dtype, buffer=block.buf)
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Собирает DataFrame поверх общей памяти. Числовые столбцы и коды строк не копируются, словари строк
+        распаковываются один раз на процесс. DataFrame нельзя использовать после close.
+
+        >>> df = pd.DataFrame({'name': ['a', 'b', 'a'], 'salary': pd.array([1, None, 3], dtype='Int64'),
+        ...                    'published_at': np.array([2020, 2021, 2022], dtype='int32')})
+        >>> with SharedColumns.publish(df) as owner:
+        ...     worker = SharedColumns.attach(owner.spec)
+        ...     shared = worker.to_frame()
+        ...     print(shared['name'].tolist(), shared['salary'].tolist(), shared['published_at'].tolist())
+        ...     del shared
+        ...     worker.close()
+        ['a', 'b', 'a'] [1, <NA>, 3] [2020, 2021, 2022]
+        """
+        columns = {}
+        for column, description in self.spec.items():
+            length = description["length"]
+            if description["kind"] == "masked":
+                dtype = pd.api.types.pandas_dtype(description["dtype"])
+                values = self._get_array(description["values"], dtype.numpy_dtype, length)
+                mask = self._get_array(description["mask"], np.bool_, length)
+                columns[column] = pd.arrays.IntegerArray(values, mask, copy=False)
+            elif description["kind"] == "numeric":
+                columns[column] = self._get_array(description["values"], np.dtype(description["dtype"]), length)
+            else:
+                codes = self._get_array(description["codes"], np.dtype(description["codes_dtype"]), length)
+                dictionary = self._get_array(description["dictionary"], np.uint8, description["dictionary_size"])
+                categories = pickle.loads(dictionary.tobytes())
+                columns[column] = pd.Categorical.from_codes(codes, categories=categories, validate=False)
+        return pd.DataFrame(columns, copy=False)
+
+    def close(self) -> None:
+        """
+        Отключает блоки от этого процесса.
+        """
+        for block in self.blocks:
+            block.close()
+
+    def unlink(self) -> None:
+        """
+        Удаляет блоки. Вызывается владельцем, когда рабочие процессы закончили.
+        """
+        for block in self.blocks:
+            block.unlink()
+        self.blocks = []
@@ -0,0 +1,148 @@
+from html import escape
+from math import cos, sin, pi, floor, log10
+
+COLORS = ["#1f77b4", "#ff7f0e", "#2ca02c", "#d62728", "#9467bd", "#8c564b", "#e377c2", "#7f7f7f", "#bcbd22",
+          "#17becf"]
+WIDTH = 480
+HEIGHT = 340
+
+
+def format_number(value: float) -> str:
+    """
+    Форматирует подпись оси: целые числа с разделителем разрядов, дроби - с двумя знаками.
+
+    >>> format_number(125000), format_number(0.25)
+    ('125 000', '0.25')
+    """
+    if float(value).is_integer():
+        return f"{int(value):,}".replace(",", " ")
+    return f"{value:.2f}"
+
+
+def get_ticks(maximum: float, count: int = 5) -> list:
+    """
+    Возвращает деления оси от 0 до maximum с «круглым» шагом.
+
+    >>> get_ticks(930)
+    [0, 200, 400, 600, 800, 1000]
+    """
+    if maximum <= 0:
+        return [0, 1]
+    step = maximum / count
+    magnitude = 10 ** floor(log10(step))
+    for multiplier in (1, 2, 2.5, 5, 10):
+        if magnitude * multiplier >= step:
+            step = magnitude * multiplier
+            break
+    ticks = [0]
+    while ticks[-1] < maximum:
+        ticks.append(round(ticks[-1] + step, 10))
+    return [int(tick) if float(tick).is_integer() else tick for tick in ticks]
+
+
+def _open_svg(title: str) -> list:
+    return [f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {WIDTH} {HEIGHT}" width="{WIDTH}" '
+            f'height="{HEIGHT}" font-family="sans-serif" font-size="10">',
+            f'<text x="{WIDTH / 2}" y="16" text-anchor="middle" font-size="13">{escape(title)}</text>']
+
+
+def get_bar_chart(title: str, series: list) -> str:
+    """
+    Рисует столбчатую диаграмму с несколькими рядами рядом, как Report.draw_bar_graph.
+
+    :param title: Название графика.
+    :param series: Список пар (подпись ряда, {категория: значение}). Категории берутся из первого ряда.
+    :returns: SVG-разметка.
+    """
+    left, right, top, bottom = 60, 10, 50, 50
+    categories = list(series[0][1].keys())
+    ticks = get_ticks(max([value for _, values in series for value in values.values()] + [0]))
+    plot_width, plot_height = WIDTH - left - right, HEIGHT - top - bottom
+    scale = plot_height / ticks[-1]
+    group_width = plot_width / max(len(categories), 1)
+    bar_width = group_width * 0.8 / len(series)
+
+    svg = _open_svg(title)
+    for tick in ticks:
+        y = top + plot_height - tick * scale
+        svg.append(f'<line x1="{left}" y1="{y:.1f}" x2="{WIDTH - right}" y2="{y:.1f}" stroke="#ddd"/>')
+        svg.append(f'<text x="{left - 4}" y="{y + 3:.1f}" text-anchor="end">{format_number(tick)}</text>')
+    for index, (label, values) in enumerate(series):
+        for position, category in enumerate(categories):
+            value = values.get(category, 0)
+            x = left + position * group_width + group_width * 0.1 + index * bar_width
+            svg.append(f'<rect x="{x:.1f}" y="{top + plot_height - value * scale:.1f}" width="{bar_width:.1f}" '
+                       f'height="{value * scale:.1f}" fill="{COLORS[index % len(COLORS)]}"/>')
+        svg.append(f'<rect x="{left + 4}" y="{24 + index * 12}" width="10" height="8" '
+                   f'fill="{COLORS[index % len(COLORS)]}"/>')
+        svg.append(f'<text x="{left + 18}" y="{32 + index * 12}">{escape(label)}</text>')
+    for position, category in enumerate(categories):
+        x = left + (position + 0.5) * group_width
+        y = top + plot_height + 4
+        svg.append(f'<text x="{x:.1f}" y="{y}" text-anchor="end" dominant-baseline="middle" '
+                   f'transform="rotate(-90 {x:.1f} {y})">{escape(str(category))}</text>')
+    svg.append('</svg>')
+    return "\n".join(svg)
+
+
+def get_horizontal_bar_chart(title: str, values: dict) -> str:
+    """
+    Рисует горизонтальную столбчатую диаграмму сверху вниз, как Report.draw_invert_bar_graph.
+
+    :param title: Название графика.
+    :param values: {категория: значение}.
+    :returns: SVG-разметка.
+    """
+    left, right, top, bottom = 120, 15, 30, 20
+    ticks = get_ticks(max(list(values.values()) + [0]))
+    plot_width, plot_height = WIDTH - left - right, HEIGHT - top - bottom
+    scale = plot_width / ticks[-1]
+    row_height = plot_height / max(len(values), 1)
+
+    svg = _open_svg(title)
+    for tick in ticks:
+        x = left + tick * scale
+        svg.append(f'<line x1="{x:.1f}" y1="{top}" x2="{x:.1f}" y2="{top + plot_height}" stroke="#ddd"/>')
+        svg.append(f'<text x="{x:.1f}" y="{HEIGHT - 6}" text-anchor="middle">{format_number(tick)}</text>')
+    for position, (category, value) in enumerate(values.items()):
+        y = top + position * row_height
+        svg.append(f'<rect x="{left}" y="{y + row_height * 0.1:.1f}" width="{value * scale:.1f}" '
+                   f'height="{row_height * 0.8:.1f}" fill="{COLORS[0]}"/>')
+        svg.append(f'<text x="{left - 4}" y="{y + row_height / 2:.1f}" text-anchor="end" '
+                   f'dominant-baseline="middle">{escape(str(category))}</text>')
+    svg.append('</svg>')
+    return "\n".join(svg)
+
+
+def get_pie_chart(title: str, values: dict) -> str:
+    """
+    Рисует круговую диаграмму, как Report.draw_pie_graph: доли откладываются против часовой стрелки от оси x.
+
+    :param title: Название графика.
+    :param values: {категория: доля}, сумма долей не больше 1.
+    :returns: SVG-разметка.
+    """
+    center_x, center_y, radius = WIDTH / 2, HEIGHT / 2 + 10, 110
+    total = sum(values.values()) or 1
+    svg = _open_svg(title)
+    angle = 0.0
+    for index, (category, value) in enumerate(values.items()):
+        sweep = 2 * pi * value / total
+        if sweep <= 0:
+            continue
+        x1, y1 = center_x + radius * cos(angle), center_y - radius * sin(angle)
+        x2, y2 = center_x + radius * cos(angle + sweep), center_y - radius * sin(angle + sweep)
+        color = COLORS[index % len(COLORS)]
+        if sweep >= 2 * pi - 1e-9:
+            svg.append(f'<circle cx="{center_x}" cy="{center_y}" r="{radius}" fill="{color}"/>')
+        else:
+            svg.append(f'<path d="M{center_x},{center_y} L{x1:.1f},{y1:.1f} A{radius},{radius} 0 '
+                       f'{1 if sweep > pi else 0},0 {x2:.1f},{y2:.1f} Z" fill="{color}"/>')
+        middle = angle + sweep / 2
+        label_x, label_y = center_x + (radius + 8) * cos(middle), center_y - (radius + 8) * sin(middle)
+        anchor = "start" if cos(middle) >= 0 else "end"
+        svg.append(f'<text x="{label_x:.1f}" y="{label_y:.1f}" text-anchor="{anchor}" font-size="8" '
+                   f'dominant-baseline="middle">{escape(str(category))}</text>')
+        angle += sweep
+    svg.append('</svg>')
+    return "\n".join(svg)
@@ -0,0 +1,186 @@
+import numpy as np
+import pandas as pd
+
+from NameMasks import NameMasks
+
+DEFAULT_RULES: dict = {
+    "profession": {
+        "Программист": ["программист"],
+        "IT": ["it"],
+        "Аналитик": ["аналитик"],
+    },
+    "seniority": {
+        "Senior": ["senior"],
+        "Middle": ["middle"],
+        "Junior": ["junior"],
+    },
+}
+
+
+class Taxonomy:
+    """
+    Классификация названий вакансий по профессиям и уровням по набору правил. Классификация выполняется один раз при
+    загрузке, метки хранятся в DataFrame целочисленными столбцами-масками: бит i соответствует i-й метке группы.
+
+    Attributes
+    ----------
+    rules : dict
+        {столбец: {метка: [регулярные выражения для названия в нижнем регистре]}}.
+    labels : dict
+        {столбец: [метки в порядке битов]}.
+    """
+
+    rules: dict
+    labels: dict
+
+    def __init__(self, rules: dict = None):
+        """
+        Инициализирует объект Taxonomy.
+
+        :param rules: Набор правил. По-умолчанию DEFAULT_RULES - термины из запроса 3.4.2.
+        """
+        self.rules = rules if rules is not None else DEFAULT_RULES
+        self.labels = {column: list(labels) for column, labels in self.rules.items()}
+        for column, labels in self.labels.items():
+            if len(labels) > 64:
+                raise ValueError(f"В группе {column} больше 64 меток")
+
+    @staticmethod
+    def get_dtype(labels: list) -> str:
+        for dtype in ("uint8", "uint16", "uint32"):
+            if len(labels) <= np.iinfo(dtype).bits:
+                return dtype
+        return "uint64"
+
+    def classify(self, df: pd.DataFrame, name_column: str = "name") -> pd.DataFrame:
+        """
+        Добавляет в DataFrame столбцы меток.
+
+        :param df: Выборка вакансий.
+        :param name_column: Столбец с названием вакансии.
+        :returns: DataFrame со столбцами из rules.
+
+        >>> df = Taxonomy().classify(pd.DataFrame({'name': ['Senior программист', 'IT аналитик', 'Водитель']}))
+        >>> df['profession'].tolist(), df['seniority'].tolist()
+        ([1, 6, 0], [1, 0, 0])
+        """
+        lower_names = df[name_column].str.lower()
+        columns = {}
+        for column, labels in self.rules.items():
+            dtype = self.get_dtype(self.labels[column])
+            mask = np.zeros(len(df), dtype=dtype)
+            for bit, patterns in enumerate(labels.values()):
+                matches = lower_names.str.contains("|".join(patterns), regex=True).fillna(False).to_numpy(bool)
+                mask[matches] |= np.array(1 << bit, dtype=dtype)
+            columns[column] = mask
+        return df.assign(**columns)
+
+    def find_label(self, label: str) -> (str, int) or None:
+        """
+        Ищет метку без учёта регистра.
+
+        :returns: (столбец, номер бита) или None, если такой метки нет.
+        """
+        for column, labels in self.labels.items():
+            for bit, known in enumerate(labels):
+                if known.lower() == label.lower():
+                    return column, bit
+        return None
+
+    def is_label_query(self, profession_name: str) -> bool:
+        """
+        Проверяет, что все части запроса через '|' - известные метки и запрос можно выполнить по маскам меток.
+
+        >>> Taxonomy().is_label_query('Программист|IT'), Taxonomy().is_label_query('Программист|водитель')
+        (True, False)
+        """
+        return all(self.find_label(label) is not None for label in profession_name.split("|"))
+
+    def get_mask(self, df: pd.DataFrame, labels: list) -> np.ndarray:
+        """
+        Возвращает булеву маску вакансий, у которых есть хотя бы одна из меток.
+
+        :param df: Классифицированная выборка вакансий.
+        :param labels: Список меток из любых групп.
+        """
+        bits = {}
+        for label in labels:
+            found = self.find_label(label)
+            if found is None:
+                raise KeyError(f"Неизвестная метка: {label}")
+            column, bit = found
+            bits[column] = bits.get(column, 0) | 1 << bit
+
+        mask = np.zeros(len(df), dtype=bool)
+        for column, column_bits in bits.items():
+            mask |= (df[column].to_numpy() & column_bits) != 0
+        return mask
+
+    def explode(self, df: pd.DataFrame, column: str, fields: list = None) -> pd.DataFrame:
+        """
+        Разворачивает столбец меток в длинную таблицу: вакансия с несколькими метками попадает в неё несколько раз.
+        Результат удобен для groupby по столбцу label.
+
+        :param df: Классифицированная выборка вакансий.
+        :param column: Группа меток, например 'profession'.
+        :param fields: Столбцы, которые нужно сохранить. По-умолчанию salary и published_at.
+        :returns: DataFrame с категориальным столбцом label.
+        """
+        fields = fields or ["salary", "published_at"]
+        values = df[column].to_numpy()
+        parts = []
+        for bit, label in enumerate(self.labels[column]):
+            part = df.loc[(values >> bit & 1).astype(bool), fields]
+            parts.append(part.assign(label=label))
+        result = pd.concat(parts, ignore_index=True)
+        return result.assign(label=pd.Categorical(result["label"], categories=self.labels[column]))
+
+    def get_statistics_by_labels(self, df: pd.DataFrame, column: str) -> pd.DataFrame:
+        """
+        Считает по каждой метке и году сумму и количество зарплат, среднюю зарплату и количество вакансий.
+
+        :param df: Классифицированная выборка вакансий.
+        :param column: Группа меток, например 'profession'.
+        :returns: DataFrame с индексом (label, published_at).
+        """
+        return (self.explode(df, column)
+                .groupby(["label", "published_at"], observed=True)
+                .agg(salary_sum=("salary", "sum"), count=("published_at", "size"))
+                .assign(salary=lambda x: x["salary_sum"] // x["count"])
+                )
+
+
+class LabelIndex:
+    """
+    Поиск по профессии для классифицированного DataFrame. Совместим с NameIndex по методу search: если все части
+    запроса - известные метки, используется маска меток, иначе - кэшированные маски NameMasks.
+    """
+
+    taxonomy: Taxonomy
+    df: pd.DataFrame
+    _masks: NameMasks or None
+
+    def __init__(self, taxonomy: Taxonomy, df: pd.DataFrame):
+        self.taxonomy = taxonomy
+        self.df = df
+        self._masks = None
+
+    def search(self, profession_name: str) -> np.ndarray:
+        """
+        Возвращает метки строк df, подходящих под запрос.
+
+        :param profession_name: Название профессии, можно несколько через разделитель '|'.
+
+        >>> t = Taxonomy()
+        >>> df = t.classify(pd.DataFrame({'name': ['Senior программист', 'IT аналитик', 'Водитель']}))
+        >>> LabelIndex(t, df).search('Программист|IT').tolist()
+        [0, 1]
+        >>> LabelIndex(t, df).search('водитель').tolist()
+        [2]
+        """
+        if self.taxonomy.is_label_query(profession_name):
+            return self.df.index.to_numpy()[self.taxonomy.get_mask(self.df, profession_name.split("|"))]
+
+        if self._masks is None:
+            self._masks = NameMasks(self.df["name"])
+        return self._masks.search(profession_name)
@@ -0,0 +1,52 @@
+import os
+
+from jinja2 import Environment, FileSystemLoader, FileSystemBytecodeCache, Template
+
+BYTECODE_DIRECTORY = ".jinja_cache"
+
+_environments = {}
+
+
+def get_environment(directory: str = ".", autoescape: bool = False) -> Environment:
+    """
+    Возвращает общее на процесс окружение jinja2 для папки шаблонов. Скомпилированные шаблоны хранятся в окружении,
+    байткод - в BYTECODE_DIRECTORY внутри папки шаблонов, поэтому следующие запуски не компилируют шаблоны заново.
+
+    :param directory: Папка шаблонов.
+    :param autoescape: Экранировать ли подставляемые значения.
+
+    >>> get_environment('.') is get_environment('.')
+    True
+    """
+    key = (os.path.abspath(directory), autoescape)
+    if key not in _environments:
+        cache_directory = os.path.join(key[0], BYTECODE_DIRECTORY)
+        os.makedirs(cache_directory, exist_ok=True)
+        _environments[key] = Environment(loader=FileSystemLoader(key[0]), autoescape=autoescape,
+                                         bytecode_cache=FileSystemBytecodeCache(cache_directory))
+    return _environments[key]
+
+
+def get_template(name: str, directory: str = ".", autoescape: bool = False) -> Template:
+    """
+    Возвращает скомпилированный шаблон. Изменённый на диске шаблон перекомпилируется автоматически.
+
+    :param name: Имя файла шаблона.
+    :param directory: Папка шаблонов.
+    :param autoescape: Экранировать ли подставляемые значения.
+    """
+    return get_environment(directory, autoescape).get_template(name)
+
+
+def render_to_file(template: Template, context: dict, file_name: str, buffer_size: int = 64) -> None:
+    """
+    Рендерит шаблон в файл потоково: вывод пишется частями по buffer_size фрагментов и не собирается в одну строку.
+
+    :param template: Шаблон jinja2.
+    :param context: Переменные шаблона.
+    :param file_name: Путь до файла.
+    :param buffer_size: Количество фрагментов вывода в одной записи.
+    """
+    stream = template.stream(context)
+    stream.enable_buffering(buffer_size)
+    stream.dump(file_name, encoding="utf-8")
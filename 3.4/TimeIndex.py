@@ -0,0 +1,97 @@
+import numpy as np
+import pandas as pd
+
+
+def to_timestamp(value) -> int:
+    """
+    Переводит дату в секунды от начала эпохи по местному времени записи: часовой пояс отбрасывается, поэтому
+    вакансия попадает в период по той же дате, что и год в add_year, партиции и куб. Даты без часового пояса
+    считаются датами в местном времени вакансий.
+
+    :param value: Строка ISO-формата, datetime, date или pd.Timestamp.
+
+    >>> to_timestamp('1970-01-02')
+    86400
+    >>> to_timestamp('2022-01-01T00:30:00+0300') - to_timestamp('2022-01-01')
+    1800
+    """
+    timestamp = pd.Timestamp(value)
+    return int(timestamp.tz_localize(None).tz_localize("UTC").timestamp())
+
+
+class TimeIndex:
+    """
+    Индекс по времени публикации: перестановка номеров строк, отсортированная по компактной метке времени
+    (uint32, секунды от начала эпохи). Запрос за период - два бинарных поиска, затрагиваются только строки периода.
+
+    Attributes
+    ----------
+    timestamps : np.ndarray
+        Отсортированные метки времени.
+    positions : np.ndarray
+        Номера строк датасета в порядке возрастания времени публикации.
+    """
+
+    timestamps: np.ndarray
+    positions: np.ndarray
+
+    def __init__(self, published_at: pd.Series):
+        """
+        Строит индекс по столбцу published_at в исходном формате, например 2022-07-05T18:19:30+0300. Метки
+        времени - местное время записи без часового пояса.
+
+        :param published_at: Столбец дат публикации в порядке строк датасета.
+        """
+        published_at = pd.to_datetime(pd.Series(published_at).str[:19], format="%Y-%m-%dT%H:%M:%S")
+        seconds = ((published_at - pd.Timestamp(0)) // pd.Timedelta(seconds=1)).to_numpy("int64")
+        self.positions = np.argsort(seconds, kind="stable").astype(np.uint32)
+        self.timestamps = seconds[self.positions].astype(np.uint32)
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def get_positions(self, date_from=None, date_to=None) -> np.ndarray:
+        """
+        Возвращает номера строк, опубликованных в полуинтервале [date_from, date_to).
+
+        :param date_from: Начало периода включительно. None - без ограничения.
+        :param date_to: Конец периода не включительно. None - без ограничения.
+
+        >>> index = TimeIndex(pd.Series(['2022-01-02T00:00:00+0000', '2020-05-01T00:00:00+0000',
+        ...                              '2021-01-01T00:00:00+0000']))
+        >>> index.get_positions('2021-01-01', '2023-01-01').tolist()
+        [2, 0]
+        """
+        start = 0 if date_from is None else np.searchsorted(self.timestamps, to_timestamp(date_from), "left")
+        end = len(self) if date_to is None else np.searchsorted(self.timestamps, to_timestamp(date_to), "left")
+        return self.positions[start:end]
+
+    def slice(self, df: pd.DataFrame, date_from=None, date_to=None) -> pd.DataFrame:
+        """
+        Возвращает вакансии за период в исходном порядке строк. Метки индекса DataFrame сохраняются.
+
+        :param df: Датасет, по которому строился индекс.
+        :param date_from: Начало периода включительно.
+        :param date_to: Конец периода не включительно.
+        """
+        if date_from is None and date_to is None:
+            return df
+        return df.iloc[np.sort(self.get_positions(date_from, date_to))]
+
+
+def slice_period(df: pd.DataFrame, date_from=None, date_to=None) -> pd.DataFrame:
+    """
+    Возвращает вакансии за период по строковому столбцу published_at. Индекс строится, только если задана хотя бы
+    одна граница периода, без периода датасет возвращается как есть.
+
+    :param df: Датасет с датой публикации в исходном формате.
+    :param date_from: Начало периода включительно.
+    :param date_to: Конец периода не включительно.
+
+    >>> df = pd.DataFrame({'published_at': ['не дата']})
+    >>> slice_period(df) is df
+    True
+    """
+    if date_from is None and date_to is None:
+        return df
+    return TimeIndex(df["published_at"]).slice(df, date_from, date_to)
@@ -0,0 +1,207 @@
+import os
+import pickle
+import re
+
+import numpy as np
+import pandas as pd
+
+TRANSLITERATION: dict = {
+    "а": "a", "б": "b", "в": "v", "г": "g", "д": "d", "е": "e", "ё": "e", "ж": "zh", "з": "z", "и": "i",
+    "й": "y", "к": "k", "л": "l", "м": "m", "н": "n", "о": "o", "п": "p", "р": "r", "с": "s", "т": "t",
+    "у": "u", "ф": "f", "х": "h", "ц": "ts", "ч": "ch", "ш": "sh", "щ": "sch", "ъ": "", "ы": "y", "ь": "",
+    "э": "e", "ю": "yu", "я": "ya",
+}
+WORD_PATTERN = re.compile(r"[^\W_]+")
+INDEX_VERSION = 1
+
+
+def normalize_fuzzy(text: str) -> str:
+    """
+    Приводит строку к виду для нечёткого сравнения: нижний регистр, ё = е, кириллица транслитерируется в латиницу,
+    остаются только слова через пробел.
+
+    :param text: Название вакансии или запрос пользователя.
+
+    >>> normalize_fuzzy('Программист-Разработчик'), normalize_fuzzy('programmist razrabotchik')
+    ('programmist razrabotchik', 'programmist razrabotchik')
+    """
+    if not isinstance(text, str):
+        return ""
+    text = "".join(TRANSLITERATION.get(char, char) for char in text.lower())
+    return " ".join(WORD_PATTERN.findall(text))
+
+
+def get_trigrams(text: str) -> set:
+    """
+    Возвращает множество триграмм нормализованной строки. Каждое слово дополняется двумя пробелами в начале и одним в
+    конце, как в pg_trgm.
+
+    >>> sorted(get_trigrams('it'))
+    ['  i', ' it', 'it ']
+    """
+    trigrams = set()
+    for word in text.split():
+        padded = f"  {word} "
+        trigrams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return trigrams
+
+
+class TrigramIndex:
+    """
+    Триграммный индекс по уникальным названиям вакансий для нечёткого поиска профессии: опечатки, транслит, ё/е.
+    Похожесть названия на запрос - доля триграмм запроса, встречающихся в названии.
+
+    Attributes
+    ----------
+    names : pd.Index
+        Уникальные названия вакансий.
+    codes : np.ndarray
+        Номер уникального названия для каждой строки датасета.
+    labels : np.ndarray
+        Метки строк датасета: для Series - её индекс, для списка - номера строк.
+    postings : dict
+        {триграмма: массив номеров уникальных названий}.
+    threshold : float
+        Минимальная похожесть по-умолчанию.
+    signature : tuple
+        Размер и время изменения CSV-файла, по которому построен индекс.
+    """
+
+    names: pd.Index
+    codes: np.ndarray
+    labels: np.ndarray
+    postings: dict
+    threshold: float
+    signature: tuple
+
+    def __init__(self, names, threshold: float = 0.6, signature: tuple = None):
+        """
+        Строит индекс.
+
+        :param names: Названия вакансий в порядке строк датасета, обычно столбец DataFrame.
+        :param threshold: Минимальная похожесть от 0 до 1.
+        :param signature: Подпись исходного файла для проверки актуальности сохранённого индекса.
+        """
+        names = pd.Series(names, dtype="object")
+        self.codes, self.names = pd.factorize(names, use_na_sentinel=True)
+        self.labels = names.index.to_numpy()
+        self.threshold = threshold
+        self.signature = signature
+
+        name_ids = {}
+        for name_id, name in enumerate(self.names):
+            for trigram in get_trigrams(normalize_fuzzy(name)):
+                name_ids.setdefault(trigram, []).append(name_id)
+        self.postings = {trigram: np.array(ids, dtype=np.uint32) for trigram, ids in name_ids.items()}
+
+    # region Persistence
+    @staticmethod
+    def get_signature(file_name: str) -> tuple:
+        stat = os.stat(file_name)
+        return stat.st_size, stat.st_mtime_ns
+
+    @classmethod
+    def from_csv(cls, file_name: str) -> 'TrigramIndex':
+        """
+        Строит индекс по столбцу name CSV-файла. Метки строк - номера строк файла, как у Loader.load_vacancies,
+        поэтому индекс применим и к вакансиям, отобранным за период.
+
+        :param file_name: Путь до CSV-файла.
+        """
+        names = pd.read_csv(file_name, usecols=["name"], dtype={"name": "str"})["name"]
+        return cls(names, signature=cls.get_signature(file_name))
+
+    @classmethod
+    def for_file(cls, file_name: str, index_file: str = None) -> 'TrigramIndex':
+        """
+        Возвращает сохранённый индекс для CSV-файла, если он актуален, иначе строит и сохраняет новый, как
+        NameIndex.for_file.
+
+        :param file_name: Путь до CSV-файла.
+        :param index_file: Путь до файла индекса. По-умолчанию рядом с CSV-файлом с расширением .trgidx.
+        """
+        index_file = index_file or f"{os.path.splitext(file_name)[0]}.trgidx"
+        if os.path.exists(index_file):
+            index = cls.load(index_file)
+            if index is not None and index.signature == cls.get_signature(file_name):
+                return index
+
+        index = cls.from_csv(file_name)
+        index.save(index_file)
+        return index
+
+    def save(self, file_name: str) -> None:
+        with open(file_name, "wb") as file:
+            pickle.dump({"version": INDEX_VERSION,
+                         "signature": self.signature,
+                         "threshold": self.threshold,
+                         "names": self.names,
+                         "codes": self.codes,
+                         "labels": self.labels,
+                         "postings": self.postings}, file, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, file_name: str) -> 'TrigramIndex' or None:
+        """
+        Загружает индекс из файла.
+
+        :returns: Индекс или None, если файл создан другой версией индекса.
+        """
+        with open(file_name, "rb") as file:
+            state = pickle.load(file)
+        if state.get("version") != INDEX_VERSION:
+            return None
+        index = cls.__new__(cls)
+        for attribute in ("signature", "threshold", "names", "codes", "labels", "postings"):
+            setattr(index, attribute, state[attribute])
+        return index
+
+    # endregion
+
+    def get_similarities(self, query: str) -> np.ndarray:
+        """
+        Возвращает похожесть запроса на каждое уникальное название.
+
+        :param query: Одна профессия без разделителя '|'.
+        """
+        trigrams = get_trigrams(normalize_fuzzy(query))
+        if not trigrams:
+            return np.zeros(len(self.names))
+        hits = [self.postings[trigram] for trigram in trigrams if trigram in self.postings]
+        if not hits:
+            return np.zeros(len(self.names))
+        return np.bincount(np.concatenate(hits), minlength=len(self.names)) / len(trigrams)
+
+    def get_matched_names(self, profession_name: str, threshold: float = None) -> pd.Series:
+        """
+        Возвращает найденные варианты названий, чтобы пользователь мог их проверить.
+
+        :param profession_name: Название профессии, можно несколько через разделитель '|'.
+        :param threshold: Минимальная похожесть. По-умолчанию self.threshold.
+        :returns: Series {название: похожесть}, отсортированный по убыванию похожести.
+
+        >>> index = TrigramIndex(['Программист', 'Web-программист', 'Водитель'])
+        >>> index.get_matched_names('програмист').index.tolist()
+        ['Программист', 'Web-программист']
+        """
+        threshold = self.threshold if threshold is None else threshold
+        similarities = np.zeros(len(self.names))
+        for query in profession_name.split("|"):
+            similarities = np.maximum(similarities, self.get_similarities(query))
+
+        matched = np.flatnonzero(similarities >= threshold)
+        return (pd.Series(similarities[matched], index=self.names[matched], name="similarity")
+                .sort_values(ascending=False, kind="stable"))
+
+    def search(self, profession_name: str, threshold: float = None) -> np.ndarray:
+        """
+        Возвращает метки строк, название которых похоже на запрос. Совместим с NameIndex по методу search.
+
+        :param profession_name: Название профессии, можно несколько через разделитель '|'.
+        :param threshold: Минимальная похожесть. По-умолчанию self.threshold.
+
+        >>> TrigramIndex(['Программист', 'Водитель', 'программист']).search('programmist').tolist()
+        [0, 2]
+        """
+        matched = self.names.get_indexer(self.get_matched_names(profession_name, threshold).index)
+        return self.labels[np.isin(self.codes, matched)]
@@ -0,0 +1,590 @@
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+import pandas as pd
+from openpyxl import load_workbook
+
+from Aggregation import aggregate_chunks, get_partial_statistics, merge_partial_statistics, finalize_statistics, \
+    get_batch_data, get_statistics
+from ArtifactCache import ArtifactCache, get_report_key
+from Benchmarks import load_report_module
+from ChartRenderer import ChartRenderer
+from Cube import Cube
+from Deduplication import Deduplicator
+from ExcelWriter import StreamingExcelWriter, add_report_charts
+from Loader import add_year, iter_vacancies, load_parquet, load_vacancies
+from NameIndex import NameIndex
+from NameMasks import NameMasks
+from Partitions import aggregate_partitions, partition_csv, partition_parquet
+from PdfWriter import PdfWriter
+from SharedColumns import SharedColumns
+from SvgCharts import get_bar_chart, get_pie_chart
+from Taxonomy import Taxonomy, LabelIndex
+from Templates import get_template, render_to_file, BYTECODE_DIRECTORY
+from TimeIndex import TimeIndex, slice_period
+from TrigramIndex import TrigramIndex
+
+
+class NameIndexTests(TestCase):
+    names = ['Программист Python', 'Senior Java developer', 'Аналитик данных', 'IT-рекрутер', 'Digital маркетолог',
+             'Web-программист', None]
+
+    def get_expected(self, query: str) -> list:
+        return [i for i, name in enumerate(self.names)
+                if isinstance(name, str) and any(part in name.lower() for part in query.lower().split('|'))]
+
+    def test_single_token(self):
+        self.assertEqual(NameIndex(self.names).search('программист').tolist(), self.get_expected('программист'))
+
+    def test_substring_inside_token(self):
+        self.assertEqual(NameIndex(self.names).search('it').tolist(), self.get_expected('it'))
+
+    def test_several_tokens(self):
+        self.assertEqual(NameIndex(self.names).search('web-прог').tolist(), self.get_expected('web-прог'))
+
+    def test_alternatives(self):
+        query = 'Программист|IT|Senior|Аналитик'
+        self.assertEqual(NameIndex(self.names).search(query).tolist(), self.get_expected(query))
+
+    def test_missing(self):
+        self.assertEqual(NameIndex(self.names).search('водитель').tolist(), [])
+
+
+class TaxonomyTests(TestCase):
+    df = pd.DataFrame({'name': ['Senior программист', 'IT аналитик', 'Водитель', 'Junior Digital designer'],
+                       'salary': pd.array([300, 100, None, 50], dtype='Int64'),
+                       'published_at': [2021, 2021, 2022, 2022]})
+
+    def test_multiple_labels(self):
+        df = Taxonomy().classify(self.df)
+        self.assertEqual(df['profession'].tolist(), [1, 6, 0, 2])
+
+    def test_label_search_matches_substring(self):
+        t = Taxonomy()
+        query = 'Программист|IT|Senior|Middle|Junior|Аналитик'
+        expected = [i for i, name in enumerate(self.df['name'])
+                    if any(part.lower() in name.lower() for part in query.split('|'))]
+        self.assertEqual(LabelIndex(t, t.classify(self.df)).search(query).tolist(), expected)
+
+    def test_statistics_by_labels(self):
+        t = Taxonomy()
+        stats = t.get_statistics_by_labels(t.classify(self.df), 'profession')
+        self.assertEqual(stats.loc[('IT', 2022), 'salary'], 50)
+        self.assertEqual(stats.loc[('Программист', 2021), 'count'], 1)
+
+
+class NameMasksTests(TestCase):
+    names = pd.Series(['Программист Python', 'C++ разработчик', 'IT-рекрутер', 'Senior Python аналитик', None],
+                      dtype='string')
+
+    def test_matches_regex_search(self):
+        masks = NameMasks(self.names)
+        for query in ('программист|it', 'c\\+\\+', 'python', '^it', 'нет такой'):
+            expected = self.names.str.lower().str.contains(query).fillna(False).to_numpy(bool)
+            self.assertEqual(masks.get_mask(query).tolist(), expected.tolist())
+
+    def test_terms_cache(self):
+        masks = NameMasks(self.names)
+        self.assertEqual(masks.search('Python|рекрутер').tolist(), [0, 2, 3])
+        self.assertEqual(set(masks.masks), {'python', 'рекрутер'})
+
+    def test_matches_name_index(self):
+        names = self.names.tolist() + ['R&D инженер', 'Java developer']
+        masks, index = NameMasks(names), NameIndex(names)
+        for query in ('программист|it', 'r&d', 'python senior', 'java developer', 'нет такой', '^java', 'c\\+\\+',
+                      'python.*аналитик|^it'):
+            self.assertEqual(masks.search(query).tolist(), index.search(query).tolist())
+
+
+class TrigramIndexTests(TestCase):
+    names = ['Программист', 'Web-программист', 'Водитель', 'Менеджер по продажам', 'Программист']
+
+    def test_typo(self):
+        self.assertEqual(TrigramIndex(self.names).search('програмист').tolist(), [0, 1, 4])
+
+    def test_transliteration(self):
+        self.assertEqual(TrigramIndex(self.names).search('voditel').tolist(), [2])
+
+    def test_yo(self):
+        self.assertEqual(TrigramIndex(['Ведущий специалист']).search('вёдущий').tolist(), [0])
+
+    def test_matched_names_are_unique(self):
+        self.assertEqual(TrigramIndex(self.names).get_matched_names('программист').index.tolist(),
+                         ['Программист', 'Web-программист'])
+
+    def test_for_file_reuses_saved_index(self):
+        with TemporaryDirectory() as directory:
+            file_name = os.path.join(directory, 'vacancies.csv')
+            pd.DataFrame({'name': self.names}).to_csv(file_name, index=False)
+            TrigramIndex.for_file(file_name)
+            index_file = os.path.join(directory, 'vacancies.trgidx')
+            modified = os.stat(index_file).st_mtime_ns
+            self.assertEqual(TrigramIndex.for_file(file_name).search('програмист').tolist(), [0, 1, 4])
+            self.assertEqual(os.stat(index_file).st_mtime_ns, modified)
+            pd.DataFrame({'name': self.names[2:]}).to_csv(file_name, index=False)
+            self.assertEqual(TrigramIndex.for_file(file_name).search('програмист').tolist(), [2])
+
+
+class TimeIndexTests(TestCase):
+    published_at = pd.Series(['2022-01-02T00:00:00+0300', '2020-05-01T10:00:00+0300', '2021-01-01T10:00:00+0300'])
+
+    def test_period(self):
+        self.assertEqual(TimeIndex(self.published_at).get_positions('2021-01-01', '2022-01-01').tolist(), [2])
+
+    def test_slice_keeps_labels(self):
+        df = pd.DataFrame({'published_at': self.published_at.tolist()}, index=[10, 11, 12])
+        self.assertEqual(TimeIndex(df['published_at']).slice(df, '2020-12-31').index.tolist(), [10, 12])
+
+    def test_naive_bounds_use_local_date(self):
+        published_at = pd.Series(['2022-01-01T01:30:00+0300', '2021-12-31T23:30:00+0300'])
+        index = TimeIndex(published_at)
+        self.assertEqual(index.get_positions('2022-01-01').tolist(), [0])
+        self.assertEqual(index.get_positions(date_to='2022-01-01').tolist(), [1])
+
+
+class PartialStatisticsTests(TestCase):
+    df = pd.DataFrame({'name': ['Программист', 'Аналитик', 'Программист 1С', 'Водитель'] * 30,
+                       'salary': pd.array([100, None, 300, 50] * 30, dtype='Int64'),
+                       'area_name': ['Москва', 'Пермь', 'Москва', 'Омск'] * 29 + ['Тверь'] * 4,
+                       'published_at': [2020, 2021] * 60})
+
+    def test_merged_parts_match_whole(self):
+        whole = finalize_statistics(get_partial_statistics(self.df, 'программист'))
+        parts = [get_partial_statistics(part, 'программист')
+                 for part in (self.df.iloc[:50], self.df.iloc[50:], self.df.iloc[:0])]
+        self.assertEqual(finalize_statistics(merge_partial_statistics(parts)), whole)
+
+    def test_statistics_values(self):
+        data = finalize_statistics(get_partial_statistics(self.df, 'программист'))
+        self.assertEqual(data['Уровень зарплат по годам'][1], {2020: 200})
+        self.assertEqual(data['Количество вакансий по годам'][0], {2020: 60, 2021: 60})
+        self.assertEqual(data['Уровень зарплат по городам']['Москва'], 200)
+
+    def test_index_matches_substring_search(self):
+        index = NameIndex(self.df['name'])
+        for profession_name in ('программист', 'аналитик|водитель', 'дизайнер'):
+            self.assertEqual(get_statistics(self.df, profession_name, index),
+                             get_statistics(self.df, profession_name))
+
+    def test_indexes_on_sliced_frame(self):
+        part = self.df.iloc[61:]
+        expected = get_statistics(part, 'программист')
+        taxonomy = Taxonomy()
+        indexes = [NameIndex(self.df['name']), TrigramIndex(part['name']), NameMasks(part['name']),
+                   LabelIndex(taxonomy, taxonomy.classify(part))]
+        for index in indexes:
+            self.assertEqual(get_statistics(part, 'программист', index), expected)
+        self.assertEqual(expected['Количество вакансий по годам'][1], {2020: 29})
+
+    def test_batch_matches_single_region(self):
+        combinations = [('программист', 'Москва'), ('программист', None), ('аналитик', 'Омск')]
+        data = get_batch_data(self.df, combinations)
+        cities = get_partial_statistics(self.df, '')['cities']
+        for profession_name, region in combinations:
+            part = self.df if region is None else self.df.loc[self.df['area_name'] == region]
+            expected = dict(get_partial_statistics(part, profession_name), cities=cities)
+            self.assertEqual(data[(profession_name, region)], finalize_statistics(expected))
+
+
+class CubeTests(TestCase):
+    def test_statistics_match_raw_scan(self):
+        df = PartialStatisticsTests.df
+        cube = Cube.build([df.iloc[:50], df.iloc[50:]], Taxonomy())
+        for query in ('Программист', 'Аналитик|IT'):
+            for region in (None, 'Москва', 'Тверь'):
+                expected = get_batch_data(df, [(query.lower(), region)])[(query.lower(), region)]
+                self.assertEqual(cube.get_statistics(query, region), expected)
+
+    def test_missing_region(self):
+        df = pd.DataFrame({'name': ['Программист', 'Программист', 'Водитель'], 'salary': pd.array([100, 200, 50]),
+                           'area_name': pd.Series(['Москва', None, 'Омск'], dtype='category'),
+                           'published_at': [2020, 2020, 2020]})
+        data = Cube.build([df], Taxonomy()).get_statistics('Программист')
+        self.assertEqual(data['Количество вакансий по годам'], ({2020: 3}, {2020: 2}))
+        self.assertEqual(data, get_statistics(df, 'программист'))
+
+    def test_for_file_rebuilds_stale_cube(self):
+        with TemporaryDirectory() as directory:
+            file_name = os.path.join(directory, 'vacancies.csv')
+            PartialStatisticsTests.df.assign(published_at='2020-01-01').to_csv(file_name, index=False)
+            cube = Cube.for_file(file_name, Taxonomy())
+            self.assertIsNotNone(Cube.for_file(file_name, Taxonomy(), build=False))
+            PartialStatisticsTests.df.iloc[:10].assign(published_at='2020-01-01').to_csv(file_name, index=False)
+            self.assertIsNone(Cube.for_file(file_name, Taxonomy(), build=False))
+        self.assertEqual(cube.get_statistics('Программист')['Количество вакансий по годам'][1], {2020: 60})
+
+    def test_for_file_rebuilds_rewritten_parquet(self):
+        df = PartialStatisticsTests.df.assign(published_at='2020-01-01')
+        with TemporaryDirectory() as directory:
+            file_name = os.path.join(directory, 'vacancies.csv')
+            parquet = os.path.join(directory, 'vacancies.parquet')
+            df.to_csv(file_name, index=False)
+            partition_parquet(file_name, parquet)
+            Cube.for_file(parquet, Taxonomy())
+            stat = os.stat(parquet)
+            df.iloc[:10].to_csv(file_name, index=False)
+            partition_parquet(file_name, os.path.join(directory, 'rewritten.parquet'))
+            os.replace(os.path.join(directory, 'rewritten.parquet', 'year=2020', 'part-0.parquet'),
+                       os.path.join(parquet, 'year=2020', 'part-0.parquet'))
+            os.utime(parquet, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+            self.assertIsNone(Cube.for_file(parquet, Taxonomy(), build=False))
+            cube = Cube.for_file(parquet, Taxonomy())
+        self.assertEqual(cube.get_statistics('Программист')['Количество вакансий по годам'], ({2020: 10}, {2020: 5}))
+
+
+class SharedColumnsTests(TestCase):
+    def test_statistics_from_shared_frame(self):
+        df = PartialStatisticsTests.df
+        with SharedColumns.publish(df) as owner:
+            worker = SharedColumns.attach(owner.spec)
+            shared = worker.to_frame()
+            data = finalize_statistics(get_partial_statistics(shared, 'программист'))
+            del shared
+            worker.close()
+        self.assertEqual(data, finalize_statistics(get_partial_statistics(df, 'программист')))
+
+
+class StreamingExcelWriterTests(TestCase):
+    def test_columns_widths_and_styles(self):
+        with TemporaryDirectory() as directory:
+            file_name = os.path.join(directory, 'report.xlsx')
+            with StreamingExcelWriter(file_name) as writer:
+                writer.write_columns('Города', [('Город', ['Москва', 'Санкт-Петербург']), None,
+                                                ('Доля', [0.5, 0.25, 0.125])], percent_columns=[2])
+                writer.write_rows('Строки', ['a', 'b'], ([i, i * 2] for i in range(1000)))
+            workbook = load_workbook(file_name)
+            ws = workbook['Города']
+            self.assertEqual([[cell.value for cell in row] for row in ws.iter_rows()],
+                             [['Город', None, 'Доля'], ['Москва', None, 0.5], ['Санкт-Петербург', None, 0.25],
+                              [None, None, 0.125]])
+            self.assertEqual(ws.column_dimensions['A'].width, len('Санкт-Петербург') + 1)
+            self.assertTrue(ws['A1'].font.bold)
+            self.assertEqual(ws['C4'].number_format, '0.00%')
+            self.assertEqual(ws['A2'].border.top.style, 'thin')
+            self.assertEqual(workbook['Строки'].max_row, 1001)
+
+    def test_report_charts(self):
+        with TemporaryDirectory() as directory:
+            file_name = os.path.join(directory, 'report.xlsx')
+            with StreamingExcelWriter(file_name) as writer:
+                years_ws = writer.write_columns('Статистика по годам', [('Год', [2021, 2022]), ('Средняя', [1, 2]),
+                                                                         ('IT', [3, 4]), ('Количество', [5, 6]),
+                                                                         ('IT', [7, 8])])
+                cities_ws = writer.write_columns('Статистика по городам', [('Город', ['Москва']), ('Уровень', [1]),
+                                                                           None, ('Город', ['Москва']),
+                                                                           ('Доля', [0.5])])
+                add_report_charts(years_ws, cities_ws, 2, 1, 1)
+            workbook = load_workbook(file_name)
+            self.assertEqual([type(chart).__name__ for chart in workbook['Статистика по городам']._charts],
+                             ['BarChart', 'PieChart'])
+            self.assertEqual(len(workbook['Статистика по годам']._charts), 2)
+
+
+class PdfWriterTests(TestCase):
+    def test_cyrillic_tables(self):
+        with TemporaryDirectory() as directory:
+            file_name = os.path.join(directory, 'report.pdf')
+            writer = PdfWriter('Аналитика для профессии "Программист"')
+            writer.add_table('Статистика по годам', ['Год', 'Средняя зарплата'], [[2022, 100000]] * 100, (10, 15))
+            writer.save(file_name)
+            self.assertGreater(writer.pdf.page_no(), 1)
+            with open(file_name, 'rb') as file:
+                self.assertEqual(file.read(5), b'%PDF-')
+
+
+class ArtifactCacheTests(TestCase):
+    def test_restore_after_store(self):
+        with TemporaryDirectory() as directory:
+            cache = ArtifactCache(os.path.join(directory, 'cache'))
+            targets = {'.xlsx': os.path.join(directory, 'report.xlsx')}
+            key = get_report_key({'Доля вакансий по городам': {'Москва': 0.5}}, 'IT', options={'engine': 'fpdf'})
+            self.assertFalse(cache.restore(key, targets))
+            with open(targets['.xlsx'], 'w') as file:
+                file.write('old')
+            cache.store(key, targets)
+
+            cache.detach(targets)
+            with open(targets['.xlsx'], 'w') as file:
+                file.write('new')
+            self.assertTrue(cache.restore(key, targets))
+            self.assertTrue(cache.restore(key, targets))
+            with open(targets['.xlsx']) as file:
+                self.assertEqual(file.read(), 'old')
+
+
+class SvgChartsTests(TestCase):
+    def test_bar_chart(self):
+        svg = get_bar_chart('Уровень зарплат', [('все', {2021: 100, 2022: 200}), ('<IT>', {2021: 50, 2022: 150})])
+        self.assertEqual(svg.count('<rect'), 4 + 2)
+        self.assertIn('&lt;IT&gt;', svg)
+
+    def test_pie_chart_full_circle(self):
+        self.assertIn('<circle', get_pie_chart('Доля', {'Москва': 1.0, 'Пермь': 0}))
+
+
+class TemplatesTests(TestCase):
+    def test_streamed_rendering(self):
+        with TemporaryDirectory() as directory:
+            with open(os.path.join(directory, 'rows.html'), 'w', encoding='utf-8') as file:
+                file.write('{% for row in rows %}<td>{{ row }}</td>{% endfor %}')
+            template = get_template('rows.html', directory, autoescape=True)
+            self.assertIs(template, get_template('rows.html', directory, autoescape=True))
+
+            file_name = os.path.join(directory, 'report.html')
+            render_to_file(template, {'rows': ['Москва', '<b>'] * 1000}, file_name, buffer_size=10)
+            with open(file_name, encoding='utf-8') as file:
+                self.assertEqual(file.read(), '<td>Москва</td><td>&lt;b&gt;</td>' * 1000)
+            self.assertTrue(os.listdir(os.path.join(directory, BYTECODE_DIRECTORY)))
+
+
+class ChartRendererTests(TestCase):
+    class BarReport:
+        def __init__(self, values: list):
+            self.values = values
+
+        def draw_graphs(self, axes: list) -> None:
+            for ax in axes:
+                ax.bar(range(len(self.values)), self.values)
+
+    def test_axes_are_reused(self):
+        renderer = ChartRenderer()
+        axes = list(renderer.axes)
+        first = renderer.render(self.BarReport([1, 2, 3]), dpi=50)
+        renderer.render(self.BarReport([5]), dpi=50)
+        self.assertEqual(renderer.axes, axes)
+        self.assertEqual(len(axes[0].patches), 1)
+        self.assertEqual(renderer.render(self.BarReport([1, 2, 3]), dpi=50), first)
+        self.assertTrue(first.startswith(b'\x89PNG'))
+        renderer.close()
+
+    def test_second_report_matches_fresh_render(self):
+        module = load_report_module()
+        short = module.Report({'Уровень зарплат по годам': ({2021: 10}, {2021: 5}),
+                               'Количество вакансий по годам': ({2021: 3}, {2021: 1}),
+                               'Уровень зарплат по городам': {'Омск': 10},
+                               'Доля вакансий по городам': {'Омск': 0.5}}, 'IT')
+        long = module.Report({'Уровень зарплат по годам': ({2020: 10, 2021: 200000}, {2020: 5, 2021: 150000}),
+                              'Количество вакансий по годам': ({2020: 3, 2021: 40000}, {2020: 1, 2021: 20000}),
+                              'Уровень зарплат по городам': {'Санкт-Петербург и Ленинградская область': 10},
+                              'Доля вакансий по городам': {'Санкт-Петербург и Ленинградская область': 0.5}},
+                             'Программист')
+        renderer = ChartRenderer()
+        renderer.render(short, dpi=50)
+        self.assertEqual(renderer.render(long, dpi=50), ChartRenderer().render(long, dpi=50))
+
+
+class LoaderTests(TestCase):
+    def test_typed_columns(self):
+        with TemporaryDirectory() as directory:
+            file_name = os.path.join(directory, 'vacancies.csv')
+            with open(file_name, 'w', encoding='utf-8') as file:
+                file.write('name,key_skills,salary,area_name,published_at\n'
+                           'Программист,Python,100000,Москва,2022-07-05T18:19:30+0300\n'
+                           'Аналитик,SQL,,Пермь,2021-12-31T23:59:59+0300\n')
+            df = load_vacancies(file_name, month=True)
+        self.assertEqual(list(df.columns), ['name', 'salary', 'area_name', 'published_at', 'month'])
+        self.assertEqual(df['area_name'].dtype, 'category')
+        self.assertEqual(df['published_at'].tolist(), [2022, 2021])
+        self.assertEqual(df['month'].tolist(), [7, 12])
+        self.assertTrue(df['salary'].isna().tolist()[1])
+
+    def test_deduplicator_drops_repeats(self):
+        with TemporaryDirectory() as directory:
+            file_name = os.path.join(directory, 'vacancies.csv')
+            with open(file_name, 'w', encoding='utf-8') as file:
+                file.write('name,key_skills,salary,area_name,published_at\n'
+                           'Программист,Python,100,Москва,2022-07-05T18:19:30+0300\n'
+                           'Программист,Python,100,Москва,2022-08-05T18:19:30+0300\n'
+                           'Аналитик,SQL,,Пермь,2021-12-31T23:59:59+0300\n'
+                           'Программист,Java,100,Москва,2022-07-05T18:19:30+0300\n'
+                           'Аналитик,SQL,,Пермь,2021-12-31T23:59:59+0300\n')
+            deduplicator = Deduplicator()
+            df = load_vacancies(file_name, ['name', 'published_at'], deduplicator=deduplicator)
+            chunks = Deduplicator()
+            parts = list(iter_vacancies(file_name, 2, deduplicator=chunks))
+        self.assertEqual(list(df.columns), ['name', 'published_at'])
+        self.assertEqual(df.index.tolist(), [0, 1, 2])
+        self.assertEqual(df['published_at'].tolist(), [2022, 2022, 2021])
+        self.assertEqual((deduplicator.dropped, chunks.dropped), (2, 2))
+        self.assertEqual(pd.concat(parts).index.tolist(), [0, 1, 2])
+
+    def test_chunks_match_whole_file(self):
+        df = PartialStatisticsTests.df.assign(published_at=lambda x: x['published_at'].astype(str) + '-01-01')
+        with TemporaryDirectory() as directory:
+            file_name = os.path.join(directory, 'vacancies.csv')
+            df.to_csv(file_name, index=False)
+            whole = get_statistics(load_vacancies(file_name), 'программист|водитель')
+            for chunk_size in (7, 50, 1000):
+                data = aggregate_chunks(iter_vacancies(file_name, chunk_size), 'программист|водитель')
+                self.assertEqual(data, whole)
+
+    def test_partitions_match_whole_file(self):
+        df = PartialStatisticsTests.df.assign(
+            published_at=[f'{2020 + i % 2}-{i // 10 % 12 + 1:02d}-15T10:00:00+0300' for i in range(120)])
+        periods = [(None, None), ('2021-01-01', None), ('2020-06-01', '2021-03-01'), ('2020-06-15T12:00:00', None)]
+        with TemporaryDirectory() as directory:
+            file_name = os.path.join(directory, 'vacancies.csv')
+            df.to_csv(file_name, index=False)
+            whole = load_vacancies(file_name, year=False)
+            for by, count in (('year', 2), ('month', 24)):
+                partitions = os.path.join(directory, by)
+                self.assertEqual(len(partition_csv(file_name, partitions, by)), count)
+                df.to_csv(os.path.join(partitions, 'backup.csv'), index=False)
+                for date_from, date_to in periods:
+                    self.assertEqual(
+                        aggregate_partitions(partitions, 'программист|водитель', date_from, date_to, processes=2),
+                        get_statistics(add_year(slice_period(whole, date_from, date_to)), 'программист|водитель'))
+
+    def test_partitions_overwrite(self):
+        df = PartialStatisticsTests.df.assign(published_at=lambda x: x['published_at'].astype(str) + '-01-01')
+        with TemporaryDirectory() as directory:
+            file_name = os.path.join(directory, 'vacancies.csv')
+            parquet = os.path.join(directory, 'vacancies.parquet')
+            df.to_csv(file_name, index=False)
+            partition_parquet(file_name, parquet)
+            df.loc[df['published_at'] == '2021-01-01'].to_csv(file_name, index=False)
+            with self.assertRaises(FileExistsError):
+                partition_parquet(file_name, parquet)
+            self.assertEqual(partition_parquet(file_name, parquet, overwrite=True), {'2021': 60})
+            self.assertEqual(load_vacancies(parquet)['published_at'].unique().tolist(), [2021])
+
+    def test_parquet_matches_csv(self):
+        df = PartialStatisticsTests.df.assign(published_at=lambda x: x['published_at'].astype(str) + '-01-01')
+        with TemporaryDirectory() as directory:
+            file_name = os.path.join(directory, 'vacancies.csv')
+            parquet = os.path.join(directory, 'vacancies.parquet')
+            df.to_csv(file_name, index=False)
+            self.assertEqual(partition_parquet(file_name, parquet, chunk_size=50), {'2020': 60, '2021': 60})
+            self.assertEqual(get_statistics(load_vacancies(parquet), 'программист'),
+                             get_statistics(load_vacancies(file_name), 'программист'))
+            whole = load_vacancies(file_name)
+            expected = whole.loc[(whole['area_name'] == 'Москва') & (whole['published_at'] <= 2020), 'salary']
+            filtered = load_parquet(parquet, ['salary', 'published_at'], area_name='Москва', year_to=2020)
+            empty = load_parquet(parquet, ['salary'], area_name='Москва', year_from=2021)
+        self.assertEqual(list(filtered.columns), ['salary', 'published_at'])
+        self.assertEqual(len(filtered), 58)
+        self.assertEqual(filtered['published_at'].unique().tolist(), [2020])
+        self.assertEqual(filtered['salary'].tolist(), expected.tolist())
+        self.assertEqual(len(empty), 0)
+
+
+class ReportDataTests(TestCase):
+    rows = [('Программист', 100, 'Москва', '2021-03-01T10:00:00+0300'),
+            ('Программист', 200, 'Пермь', '2021-09-01T10:00:00+0300'),
+            ('Программист', 300, 'Москва', '2022-01-01T01:00:00+0300'),
+            ('Водитель', 50, 'Пермь', '2022-05-01T10:00:00+0300'),
+            ('Аналитик', 150, 'Москва', '2020-12-31T23:00:00+0300')]
+
+    @classmethod
+    def setUpClass(cls):
+        cls.module = load_report_module()
+
+    def test_cube_matches_fallback(self):
+        periods = [(None, None), ('2021-06-01', None), ('2021-01-01', '2022-01-01'), ('2022-01-01', None)]
+        with TemporaryDirectory() as directory:
+            file_name = os.path.join(directory, 'vacancies.csv')
+            pd.DataFrame(self.rows, columns=['name', 'salary', 'area_name', 'published_at']).to_csv(file_name,
+                                                                                                   index=False)
+            inputs = [self.module.UserInput(file_name, 'Программист', 'Москва', date_from, date_to)
+                      for date_from, date_to in periods]
+            expected = [self.module.get_data(ui) for ui in inputs]
+            Cube.for_file(file_name, Taxonomy())
+            for ui, data in zip(inputs, expected):
+                self.assertEqual(self.module.get_data(ui), data)
+            self.assertIsNotNone(self.module.get_data_from_cube(inputs[2]))
+            self.assertIsNone(self.module.get_data_from_cube(inputs[1]))
+        self.assertEqual(expected[3]['Количество вакансий по годам'], ({2022: 1}, {2022: 1}))
+
+    def test_sources_match(self):
+        periods = [(None, None), ('2021-06-01', None), ('2020-12-31T12:00:00', '2022-03-01')]
+        with TemporaryDirectory() as directory:
+            file_name = os.path.join(directory, 'vacancies.csv')
+            pd.DataFrame(self.rows, columns=['name', 'salary', 'area_name', 'published_at']).to_csv(file_name,
+                                                                                                   index=False)
+            partitions = os.path.join(directory, 'partitions')
+            parquet = os.path.join(directory, 'vacancies.parquet')
+            partition_csv(file_name, partitions, 'month')
+            partition_parquet(file_name, parquet)
+            for area_name in ('Москва', ''):
+                for date_from, date_to in periods:
+                    ui = self.module.UserInput(file_name, 'программист', area_name, date_from, date_to)
+                    expected = self.module.get_data(ui)
+                    self.assertEqual(self.module.get_data_from_chunks(ui), expected)
+                    for source in (partitions, parquet):
+                        ui.file_name = source
+                        self.assertEqual(self.module.get_data(ui), expected)
+        self.assertEqual(expected['Количество вакансий по годам'], ({2020: 1, 2021: 2, 2022: 1}, {2021: 2, 2022: 1}))
+
+
+class ReportPdfTests(TestCase):
+    data = {'Уровень зарплат по годам': ({2021: 100, 2022: 200}, {2021: 50, 2022: 150}),
+            'Количество вакансий по годам': ({2021: 10, 2022: 20}, {2021: 1, 2022: 2}),
+            'Уровень зарплат по городам': {'Москва': 200, 'Пермь': 100},
+            'Доля вакансий по городам': {'Москва': 0.5, 'Пермь': 0.3}}
+
+    @classmethod
+    def setUpClass(cls):
+        cls.module = load_report_module()
+
+    def test_draft_is_replaced_by_upgrade(self):
+        release = threading.Event()
+
+        class GatedExecutor(ThreadPoolExecutor):
+            def submit(self, function, *args, **kwargs):
+                if function is ReportPdfTests.module.upgrade_report_pdf:
+                    return super().submit(lambda: release.wait(30) and function(*args, **kwargs))
+                return super().submit(function, *args, **kwargs)
+
+        with TemporaryDirectory() as directory, GatedExecutor(max_workers=2) as executor:
+            name = os.path.join(directory, 'report.pdf')
+            cache = ArtifactCache(os.path.join(directory, 'cache'))
+            upgrade = self.module.Report(self.data, 'IT').generate_pdf(name, executor, cache=cache, draft=True)
+            with open(name, 'rb') as file:
+                draft = file.read()
+            draft_inode = os.stat(name).st_ino
+            self.assertTrue(draft.startswith(b'%PDF'))
+            self.assertEqual([file for file in os.listdir(directory) if file.endswith('.tmp')], [])
+            self.assertEqual(os.listdir(cache.directory), [])
+
+            release.set()
+            self.assertEqual(upgrade.result(), name)
+            with open(name, 'rb') as file:
+                final = file.read()
+            self.assertTrue(final.startswith(b'%PDF'))
+            self.assertGreater(len(final), len(draft))
+            self.assertNotEqual(os.stat(name).st_ino, draft_inode)
+            self.assertEqual([file for file in os.listdir(directory) if file.endswith('.tmp')], [])
+            self.assertEqual(sorted(os.path.splitext(file)[1] for file in os.listdir(cache.directory)),
+                             ['.pdf', '.xlsx'])
+
+    def test_excel_pie_includes_others(self):
+        for streaming in (False, True):
+            with TemporaryDirectory() as directory:
+                file_name = os.path.join(directory, 'report.xlsx')
+                self.module.Report(self.data, 'IT').generate_excel(file_name, streaming=streaming, charts=True)
+                ws = load_workbook(file_name)['Статистика по городам']
+                self.assertEqual([ws[f'D{row}'].value for row in range(2, 5)], ['Москва', 'Пермь', 'Другие'])
+                self.assertAlmostEqual(ws['E4'].value, 0.2)
+                pie = [chart for chart in ws._charts if type(chart).__name__ == 'PieChart'][0]
+                self.assertEqual(pie.series[0].val.numRef.f, "'Статистика по городам'!$E$2:$E$4")
+
+    def test_caller_executor_produces_both_files(self):
+        with TemporaryDirectory() as directory, ProcessPoolExecutor(max_workers=2) as executor:
+            name = os.path.join(directory, 'report.pdf')
+            self.assertIsNone(self.module.Report(self.data, 'IT').generate_pdf(name, executor))
+            with open(name, 'rb') as file:
+                self.assertTrue(file.read().startswith(b'%PDF'))
+            sheets = load_workbook(os.path.join(directory, 'report.xlsx')).sheetnames
+            self.assertEqual(len(sheets), 2)
+            self.assertEqual(executor.submit(abs, -1).result(), 1)
+
+    def test_excel_failure_reaches_caller(self):
+        with TemporaryDirectory() as directory, ProcessPoolExecutor(max_workers=2) as executor:
+            name = os.path.join(directory, 'report.pdf')
+            os.mkdir(os.path.join(directory, 'report.xlsx'))
+            with self.assertRaises(OSError):
+                self.module.Report(self.data, 'IT').generate_pdf(name, executor)
+            self.assertEqual(executor.submit(abs, -1).result(), 1)